@@ -4,17 +4,11 @@ import sys
 from pathlib import Path
 
 from .cli_parser import _print_top_level_help, build_parser
-from .cli_shared import (
-    _is_no_manifest_error,
-    _raise_no_manifest_error,
-    _read_text_with_policy,
-)
-from .unpacker import unpack_to_dir
 
 
 def main(argv: list[str] | None = None) -> None:
-    parser = build_parser()
     raw_argv = list(sys.argv[1:] if argv is None else argv)
+    parser = build_parser(raw_argv)
     if not raw_argv:
         _print_top_level_help(parser)
         return
@@ -40,27 +34,9 @@ def main(argv: list[str] | None = None) -> None:
         return
 
     if args.cmd == "unpack":
-        unpack_encoding_errors = args.encoding_errors or "replace"
-        try:
-            md_text = _read_text_with_policy(
-                args.markdown,
-                encoding_errors=unpack_encoding_errors,
-            )
-        except ValueError as e:
-            parser.error(f"unpack: {e}")
-        try:
-            unpack_to_dir(
-                md_text,
-                args.out_dir,
-                strict=bool(args.strict),
-                fail_on_warning=bool(args.fail_on_warning),
-                check_machine_header=bool(args.check_machine_header),
-            )
-        except ValueError as e:
-            if _is_no_manifest_error(e):
-                _raise_no_manifest_error(parser, command_name="unpack")
-            raise
-        print(f"Unpacked into {args.out_dir}")
+        from .cli_unpack import run_unpack_command
+
+        run_unpack_command(parser, args)
         return
 
     if args.cmd == "patch":
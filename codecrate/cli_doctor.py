@@ -6,13 +6,13 @@ from .cli_doctor_helpers import _run_config_schema, _run_config_show, _run_docto
 
 
 def run_doctor_command(parser: ArgumentParser, args: Namespace) -> None:
-    if not args.root.exists() or not args.root.is_dir():
+    if not args.root.is_dir():
         parser.error(f"doctor: root is not a directory: {args.root}")
     _run_doctor(args.root)
 
 
 def run_config_show_command(parser: ArgumentParser, args: Namespace) -> None:
-    if not args.root.exists() or not args.root.is_dir():
+    if not args.root.is_dir():
         parser.error(f"config show: root is not a directory: {args.root}")
     _run_config_show(
         args.root,
@@ -6,11 +6,6 @@ from collections.abc import Sequence
 from dataclasses import fields
 from pathlib import Path
 
-try:
-    import tomllib  # py311+
-except ModuleNotFoundError:  # pragma: no cover
-    import tomli as tomllib  # pyright: ignore[reportMissingImports]
-
 from .config import (
     CONFIG_FILENAMES,
     PYPROJECT_FILENAME,
@@ -20,6 +15,7 @@ from .config import (
     config_schema_payload,
     load_config_details,
 )
+from .config_loader import _parse_toml_file
 from .security import build_ruleset
 from .tokens import TokenCounter
 
@@ -36,10 +32,14 @@ def _doctor_find_selected_config(root: Path) -> Path | None:
 
 
 def _doctor_config_state(path: Path, *, pyproject: bool) -> str:
-    if not path.exists():
+    try:
+        stat = path.stat()
+    except OSError:
         return "missing"
     try:
-        data = tomllib.loads(path.read_text(encoding="utf-8"))
+        # Shares the loader's parse cache, so the selected config file is
+        # not parsed a second time for the report.
+        data = _parse_toml_file(path, stat.st_mtime_ns, stat.st_size)
     except Exception as e:
         return f"present (parse error: {type(e).__name__})"
 
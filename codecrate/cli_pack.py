@@ -4,6 +4,7 @@ import json
 import shlex
 import sys
 from argparse import ArgumentParser, Namespace
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -15,15 +16,21 @@ from .cli_pack_helpers import (
     _print_pack_summary,
     _rename_split_parts,
     _warn_oversized_split_outputs,
+    _write_split_parts,
     resolve_standalone_unpacker_output_path,
 )
 from .cli_parser import _codecrate_version
-from .cli_shared import _prefix_repo_header
+from .cli_shared import _repo_header, _write_text_chunked
 from .formats import MANIFEST_JSON_FORMAT_VERSION
 from .index_json import build_index_payload, write_index_json
 from .output_model import PackRun
 from .pack_pipeline import (
+    _build_pack_run_in_process,
     _build_single_pack_run,
+    _emit_pack_run_warnings,
+    _pack_process_count,
+    _pack_run_labels,
+    _pack_thread_budget,
     _resolve_output_index_json_mode,
     _resolve_pack_roots_and_stdin,
 )
@@ -112,7 +119,7 @@ def _write_single_repo_outputs(
         raise SystemExit(f"pack: {e}") from e
 
     if len(parts) == 1 and parts[0].path == out_path:
-        out_path.write_text(md, encoding="utf-8")
+        _write_text_chunked(out_path, md)
         return _WrittenPackOutputs(
             wrote_split_outputs=False,
             wrote_unsplit_markdown=True,
@@ -129,14 +136,15 @@ def _write_single_repo_outputs(
             f"{', '.join(path.name for path in oversized_parts)}"
         )
 
-    split_files_written: list[Path] = []
-    for part in renamed:
-        part.path.write_text(part.content, encoding="utf-8")
-        split_files_written.append(part.path)
+    _write_split_parts(
+        [(part.path, (part.content,)) for part in renamed],
+        max_workers=pack_run.options.max_workers,
+    )
+    split_files_written = [part.path for part in renamed]
 
     wrote_unsplit_markdown = False
     if emit_standalone_unpacker:
-        out_path.write_text(md, encoding="utf-8")
+        _write_text_chunked(out_path, md)
         wrote_unsplit_markdown = True
     _warn_oversized_split_outputs(
         label=pack_run.label,
@@ -157,17 +165,16 @@ def _write_multi_repo_outputs(
     md: str,
     pack_runs: list[PackRun],
     emit_standalone_unpacker: bool,
+    collect_output_parts: bool,
 ) -> _WrittenPackOutputs:
-    all_repo_split = True
+    # Any repo without a split limit forces unsplit output, so check that
+    # before paying for splitting the repos ahead of it.
+    all_repo_split = all(run.options.split_max_chars > 0 for run in pack_runs)
     split_candidates = []
-    for run_pack in pack_runs:
+    out_parent, out_stem, out_suffix = out_path.parent, out_path.stem, out_path.suffix
+    for run_pack in pack_runs if all_repo_split else ():
         split_max_chars = run_pack.options.split_max_chars
-        if split_max_chars <= 0:
-            all_repo_split = False
-            break
-        repo_base = out_path.with_name(
-            f"{out_path.stem}.{run_pack.slug}{out_path.suffix}"
-        )
+        repo_base = out_parent / f"{out_stem}.{run_pack.slug}{out_suffix}"
         try:
             parts = split_by_max_chars(
                 run_pack.markdown,
@@ -193,7 +200,7 @@ def _write_multi_repo_outputs(
         split_candidates.append((run_pack, renamed, oversized_parts))
 
     if not all_repo_split:
-        out_path.write_text(md, encoding="utf-8")
+        _write_text_chunked(out_path, md)
         return _WrittenPackOutputs(
             wrote_split_outputs=False,
             wrote_unsplit_markdown=True,
@@ -206,31 +213,41 @@ def _write_multi_repo_outputs(
 
     split_files_written: list[Path] = []
     repo_output_parts: dict[str, list[Part]] = {}
+    pending_writes: list[tuple[Path, tuple[str, ...]]] = []
     for run_pack, renamed, oversized_parts in split_candidates:
+        header = _repo_header(run_pack.label)
         written_parts = []
         for part in renamed:
-            content_with_header = _prefix_repo_header(part.content, run_pack.label)
-            final_part = Part(
-                path=part.path,
-                content=content_with_header,
-                kind=part.kind,
-                files=part.files,
-                canonical_ids=part.canonical_ids,
-                section_types=part.section_types,
+            prefix = "" if part.content.startswith(header) else header
+            pending_writes.append((part.path, (prefix, part.content)))
+            split_files_written.append(part.path)
+            if not collect_output_parts:
+                continue
+            # The index sidecar hashes each part as written, header included.
+            written_parts.append(
+                Part(
+                    path=part.path,
+                    content=prefix + part.content,
+                    kind=part.kind,
+                    files=part.files,
+                    canonical_ids=part.canonical_ids,
+                    section_types=part.section_types,
+                )
             )
-            final_part.path.write_text(final_part.content, encoding="utf-8")
-            split_files_written.append(final_part.path)
-            written_parts.append(final_part)
         repo_output_parts[run_pack.slug] = written_parts
         _warn_oversized_split_outputs(
             label=run_pack.label,
             paths=oversized_parts,
             max_chars=run_pack.options.split_max_chars,
         )
+    _write_split_parts(
+        pending_writes,
+        max_workers=max(run.options.max_workers for run in pack_runs),
+    )
 
     wrote_unsplit_markdown = False
     if emit_standalone_unpacker:
-        out_path.write_text(md, encoding="utf-8")
+        _write_text_chunked(out_path, md)
         wrote_unsplit_markdown = True
     return _WrittenPackOutputs(
         wrote_split_outputs=True,
@@ -265,9 +282,8 @@ def _write_manifest_json_if_requested(
             for run in pack_runs
         ],
     }
-    manifest_json_path.write_text(
-        json.dumps(payload, indent=2, sort_keys=False) + "\n",
-        encoding="utf-8",
+    _write_text_chunked(
+        manifest_json_path, json.dumps(payload, indent=2, sort_keys=False), "\n"
     )
     return manifest_json_path
 
@@ -306,19 +322,21 @@ def _write_index_json_if_requested(
 
 
 def _emit_token_reports(pack_runs: list[PackRun]) -> None:
+    # Format every report first and write once, so tree formatting for large
+    # runs is not interleaved with per-line stderr writes.
+    lines: list[str] = []
     for run in pack_runs:
         if not run.options.token_report:
             continue
         backend = run.token_backend or "approx"
         enc = run.options.token_count_encoding
-        print("", file=sys.stderr)
-        print(f"Token counts for {run.label}:", file=sys.stderr)
-        print(f"- Backend: {backend} (encoding={enc})", file=sys.stderr)
-        print(f"- Output markdown: {run.output_tokens} tokens", file=sys.stderr)
-        print(
+        lines.append("")
+        lines.append(f"Token counts for {run.label}:")
+        lines.append(f"- Backend: {backend} (encoding={enc})")
+        lines.append(f"- Output markdown: {run.output_tokens} tokens")
+        lines.append(
             f"- Effective file contents ({run.effective_layout}): "
-            f"{run.total_file_tokens} tokens across {len(run.file_tokens)} file(s)",
-            file=sys.stderr,
+            f"{run.total_file_tokens} tokens across {len(run.file_tokens)} file(s)"
         )
         if run.options.top_files_len:
             top_block = (
@@ -327,15 +345,16 @@ def _emit_token_reports(pack_runs: list[PackRun]) -> None:
                 else format_top_files_by_size(run.file_bytes, run.options.top_files_len)
             )
             if top_block:
-                print(top_block, file=sys.stderr)
+                lines.append(top_block)
         if run.options.token_count_tree and run.file_tokens:
-            print(
+            lines.append(
                 format_token_count_tree(
                     run.file_tokens,
                     threshold=run.options.token_count_tree_threshold,
-                ),
-                file=sys.stderr,
+                )
             )
+    if lines:
+        sys.stderr.write("\n".join(lines) + "\n")
 
 
 def _print_pack_output_summary(
@@ -354,11 +373,21 @@ def _print_pack_output_summary(
         except ValueError:
             rel_out_path = out_path
         summary_encoding = summary_run.options.token_count_encoding
+        # A single run with --token-report already counted this exact markdown
+        # with a real tokenizer; reuse it instead of hashing and counting again.
+        known_tokens = None
+        if (
+            len(pack_runs) == 1
+            and summary_run.options.token_report
+            and summary_run.token_backend not in {"", "approx"}
+        ):
+            known_tokens = summary_run.output_tokens
         _print_pack_summary(
             out_path=rel_out_path,
             markdown=md,
             total_files=sum(run.file_count for run in pack_runs),
             encoding=summary_encoding,
+            known_tokens=known_tokens,
         )
     else:
         if outputs.wrote_split_outputs:
@@ -436,7 +465,8 @@ def _write_pack_outputs(
     *,
     pack_runs: list[PackRun],
 ) -> None:
-    out_path = args.output if args.output is not None else pack_runs[0].default_output
+    # default_output already honours an explicit -o/--output.
+    out_path = pack_runs[0].default_output
     emit_standalone_unpacker = any(
         run.options.emit_standalone_unpacker for run in pack_runs
     )
@@ -483,6 +513,9 @@ def _write_pack_outputs(
             md=md,
             pack_runs=pack_runs,
             emit_standalone_unpacker=emit_standalone_unpacker,
+            collect_output_parts=any(
+                run.options.index_json_enabled for run in pack_runs
+            ),
         )
     )
     manifest_json_path = _write_manifest_json_if_requested(
@@ -516,20 +549,35 @@ def _write_pack_outputs(
 
 def run_pack_command(parser: ArgumentParser, args: Namespace) -> None:
     roots, stdin_files = _resolve_pack_roots_and_stdin(parser, args)
+    labels = _pack_run_labels(roots)
 
-    used_labels: set[str] = set()
-    used_slugs: set[str] = set()
-    pack_runs: list[PackRun] = []
-
-    for root in roots:
-        pack_runs.append(
+    process_count = _pack_process_count(args, roots)
+    if process_count == 1:
+        pack_runs = [
             _build_single_pack_run(
                 parser,
                 args,
                 root=root,
                 stdin_files=stdin_files,
-                used_labels=used_labels,
-                used_slugs=used_slugs,
+                label=label,
+                slug=slug,
             )
-        )
+            for root, (label, slug) in zip(roots, labels, strict=True)
+        ]
+    else:
+        # Repos are independent and parsing/rendering is CPU-bound, so fan out
+        # to processes; results are collected in input order.
+        thread_budget = _pack_thread_budget(process_count)
+        with ProcessPoolExecutor(max_workers=process_count) as pool:
+            futures = [
+                pool.submit(
+                    _build_pack_run_in_process, args, root, label, slug, thread_budget
+                )
+                for root, (label, slug) in zip(roots, labels, strict=True)
+            ]
+            pack_runs = []
+            for future in futures:
+                pack_run = future.result()
+                _emit_pack_run_warnings(pack_run)
+                pack_runs.append(pack_run)
     _write_pack_outputs(parser, args, pack_runs=pack_runs)
@@ -1,28 +1,31 @@
 from __future__ import annotations
 
 import argparse
+import mmap
 import os
 import re
 import sys
 from collections.abc import Callable, Sequence
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
 from typing import Literal
 
-from .cli_shared import _prefix_repo_header
+from .cli_shared import _available_cpu_count, _repo_header, _write_text_chunked
 from .config import Config
 from .discover import DEFAULT_EXCLUDES
 from .options import PackOptions
 from .output_model import PackRun
-from .repositories import slugify_repo_label
+from .repositories import _claim_unique_name, slugify_repo_label
 from .security import SafetyFinding
 from .token_budget import Part
 from .tokens import TokenCounter
 from .udiff import normalize_newlines
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class _MeasuredFile:
     path: Path
     rel: str
@@ -46,64 +49,67 @@ def _resolve_output_dir_and_prefix(output_path: Path) -> tuple[Path, str]:
     return output_path.resolve(), "context"
 
 
-def _default_repo_label(root: Path) -> str:
-    cwd = Path.cwd().resolve()
-    resolved = root.resolve()
+def _default_repo_label(root: Path, *, cwd: Path) -> str:
+    # Both paths are already resolved by the caller; labelling many roots should
+    # not re-run realpath() on the working directory and every root.
     try:
-        rel = resolved.relative_to(cwd).as_posix()
-        return rel or resolved.name or resolved.as_posix()
+        rel = root.relative_to(cwd).as_posix()
+        return rel or root.name or root.as_posix()
     except ValueError:
-        return root.name or resolved.name or resolved.as_posix()
+        return root.name or root.as_posix()
 
 
-def _unique_label(root: Path, used: set[str]) -> str:
-    base = _default_repo_label(root)
-    label = base
-    idx = 2
-    while label in used:
-        label = f"{base}-{idx}"
-        idx += 1
-    used.add(label)
-    return label
+def _unique_label(root: Path, used: dict[str, int], *, cwd: Path) -> str:
+    return _claim_unique_name(_default_repo_label(root, cwd=cwd), used)
 
 
+@lru_cache(maxsize=256)
 def _slugify(label: str) -> str:
     return slugify_repo_label(label)
 
 
-def _unique_slug(label: str, used: set[str]) -> str:
-    base = _slugify(label)
-    slug = base
-    idx = 2
-    while slug in used:
-        slug = f"{base}-{idx}"
-        idx += 1
-    used.add(slug)
-    return slug
+def _unique_slug(label: str, used: dict[str, int]) -> str:
+    return _claim_unique_name(_slugify(label), used)
 
 
 def _combine_pack_markdown(packs: list[PackRun]) -> str:
+    # Collect header/body/newline pieces and join once instead of building a
+    # prefixed copy of every pack's markdown first.
     out: list[str] = []
+    body = ""
     for i, pack in enumerate(packs):
         if i:
             out.append("\n\n")
-        out.append(_prefix_repo_header(pack.markdown.rstrip() + "\n", pack.label))
-    return "".join(out).rstrip() + "\n"
-
-
-def _rewrite_split_part_links(text: str, filename_map: dict[str, str]) -> str:
+        body = pack.markdown.rstrip()
+        header = _repo_header(pack.label)
+        if not body.startswith(header):
+            out.append(header)
+        out.append(body)
+        out.append("\n")
+    combined = "".join(out)
+    if not body:
+        # Only an empty trailing pack can leave whitespace before the final newline.
+        return combined.rstrip() + "\n"
+    return combined
+
+
+def _split_part_link_rewriter(filename_map: dict[str, str]) -> Callable[[str], str]:
     if not filename_map:
-        return text
+        return lambda text: text
+    # Compile the alternation once and reuse it for every part of the split.
     pattern = re.compile("|".join(re.escape(name) for name in filename_map))
-    return pattern.sub(lambda m: filename_map[m.group(0)], text)
+
+    def rewrite(text: str) -> str:
+        return pattern.sub(lambda m: filename_map[m.group(0)], text)
+
+    return rewrite
 
 
 def _index_and_part_paths(base_path: Path, count: int) -> list[Path]:
-    paths = [base_path.with_name(f"{base_path.stem}.index{base_path.suffix}")]
-    paths.extend(
-        base_path.with_name(f"{base_path.stem}.part{i}{base_path.suffix}")
-        for i in range(1, count)
-    )
+    # Split the base name once instead of re-parsing it via with_name() per part.
+    parent, stem, suffix = base_path.parent, base_path.stem, base_path.suffix
+    paths = [parent / f"{stem}.index{suffix}"]
+    paths.extend(parent / f"{stem}.part{i}{suffix}" for i in range(1, count))
     return paths
 
 
@@ -125,6 +131,7 @@ def _rename_split_parts(parts: Sequence[Part], base_path: Path) -> list[Part]:
     old_names = [Path(p.path).name for p in parts]
     new_names = [p.name for p in new_paths]
     filename_map = {old: new for old, new in zip(old_names, new_names, strict=True)}
+    rewrite_links = _split_part_link_rewriter(filename_map)
 
     out: list[Part] = []
     for old, new_path in zip(parts, new_paths, strict=True):
@@ -132,7 +139,7 @@ def _rename_split_parts(parts: Sequence[Part], base_path: Path) -> list[Part]:
         out.append(
             Part(
                 path=new_path,
-                content=_rewrite_split_part_links(content, filename_map),
+                content=rewrite_links(content),
                 kind=old.kind,
                 files=old.files,
                 canonical_ids=old.canonical_ids,
@@ -145,13 +152,8 @@ def _rename_split_parts(parts: Sequence[Part], base_path: Path) -> list[Part]:
 def _oversized_split_parts(outputs: Sequence[Part], max_chars: int) -> list[Path]:
     if max_chars <= 0:
         return []
-    oversized: list[Path] = []
-    for idx, part in enumerate(outputs):
-        if idx == 0:
-            continue
-        if len(part.content) > max_chars:
-            oversized.append(part.path)
-    return oversized
+    # The first output is the index, which is allowed to exceed the limit.
+    return [part.path for part in outputs[1:] if len(part.content) > max_chars]
 
 
 def _warn_oversized_split_outputs(
@@ -174,11 +176,7 @@ def _pack_has_effective_dedupe(pack: object) -> bool:
     files = getattr(pack, "files", None)
     if files is None:
         return False
-    for fp in files:
-        for d in getattr(fp, "defs", []):
-            if getattr(d, "id", None) != getattr(d, "local_id", None):
-                return True
-    return False
+    return any(d.id != d.local_id for fp in files for d in fp.defs)
 
 
 def _resolve_effective_nav_mode(
@@ -200,13 +198,17 @@ def _print_pack_summary(
     markdown: str,
     total_files: int,
     encoding: str,
+    known_tokens: int | None = None,
 ) -> None:
     total_chars = len(markdown)
     total_tokens: str
-    try:
-        total_tokens = f"{TokenCounter(encoding).count(markdown):,}"
-    except Exception:
-        total_tokens = "n/a"
+    if known_tokens is not None:
+        total_tokens = f"{known_tokens:,}"
+    else:
+        try:
+            total_tokens = f"{TokenCounter(encoding).count(markdown):,}"
+        except Exception:
+            total_tokens = "n/a"
 
     print("", file=sys.stderr)
     print("Pack Summary:", file=sys.stderr)
@@ -228,8 +230,7 @@ def _emit_safety_warning(
     skipped = [f for f in findings if f.action == "skipped"]
     redacted = [f for f in findings if f.action == "redacted"]
     preview = ", ".join(
-        f"{item.path.relative_to(root).as_posix()} ({item.reason})"
-        for item in findings[:5]
+        f"{_rel_posix(item.path, root)} ({item.reason})" for item in findings[:5]
     )
     suffix = "" if len(findings) <= 5 else ", ..."
     print(
@@ -239,37 +240,84 @@ def _emit_safety_warning(
     )
 
 
-def _resolve_worker_count(max_workers: int, item_count: int) -> int:
+def _resolve_worker_count(
+    max_workers: int, item_count: int, *, kind: Literal["io", "cpu"] = "io"
+) -> int:
     if item_count <= 1:
         return 1
     if max_workers > 0:
         return max_workers
-    cpu = os.cpu_count() or 1
+    cpu = _available_cpu_count()
+    if kind == "cpu":
+        # Tokenizers run native code that releases the GIL, so one thread
+        # per usable core saturates them; more threads only contend.
+        return min(cpu, item_count)
     return max(2, min(32, cpu * 4, item_count))
 
 
-def _is_likely_binary(data: bytes) -> bool:
+_MMAP_MIN_BYTES = 256 * 1024
+_READ_CHUNK_BYTES = 64 * 1024
+_MEASURE_BATCH_MAX = 64
+
+# Tab/LF/CR, printable ASCII and every byte >= 0x80 (UTF-8 / extended text).
+_TEXT_BYTES = bytes([9, 10, 13, *range(32, 127), *range(128, 256)])
+
+
+# Signatures of common binary formats whose headers can be NUL-free (e.g. a
+# PDF whose first streams are plain text).
+_BINARY_MAGIC = (
+    b"\x89PNG\r\n\x1a\n",
+    b"GIF87a",
+    b"GIF89a",
+    b"\xff\xd8\xff",
+    b"%PDF-",
+    b"PK\x03\x04",
+    b"\x7fELF",
+    b"\x1f\x8b",
+)
+
+
+def _is_likely_binary(data: bytes | mmap.mmap) -> bool:
     if not data:
         return False
-    if b"\x00" in data:
+    sample = data[:4096]
+    if b"\x00" in sample or sample.startswith(_BINARY_MAGIC):
         return True
+    # Deleting the allowed bytes leaves only the suspicious ones, counted in C.
+    suspicious = len(sample.translate(None, _TEXT_BYTES))
+    if suspicious / len(sample) > 0.30:
+        return True
+    # Only scan past the sample once it looks like text, so a memory-mapped
+    # binary file is rejected without paging in more than its head.
+    return data.find(b"\x00", len(sample)) != -1
+
+
+def _rel_posix(path: Path, root: Path) -> str:
+    # Walked paths are built from root, so their string form starts with it;
+    # slicing skips relative_to's per-part comparison and new Path object.
+    path_s = str(path)
+    root_s = str(root)
+    n = len(root_s)
+    if path_s.startswith(root_s) and path_s[n : n + 1] == os.sep:
+        rel = path_s[n + 1 :]
+        return rel if os.sep == "/" else rel.replace(os.sep, "/")
+    return path.relative_to(root).as_posix()
+
+
+def _utf8_size(text: str) -> int:
+    # isascii() is a flag check on CPython strings; redacted overrides are
+    # mostly ASCII masks, so their UTF-8 size is just their length.
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
 
-    sample = data[:4096]
-    if not sample:
-        return False
 
-    text_whitespace = {9, 10, 13}
-    suspicious = 0
-    for b in sample:
-        if b in text_whitespace:
-            continue
-        if 32 <= b <= 126:
-            continue
-        if 128 <= b <= 255:
-            # UTF-8 / extended bytes are allowed.
-            continue
-        suspicious += 1
-    return suspicious / len(sample) > 0.30
+def _read_fd_bytes(fd: int, size_hint: int) -> bytes:
+    data = os.read(fd, size_hint) if size_hint > 0 else b""
+    # Keep reading past the stat size for short reads, files that grew since
+    # fstat, and special files that report a size of zero.
+    chunks = [data]
+    while chunk := os.read(fd, _READ_CHUNK_BYTES):
+        chunks.append(chunk)
+    return data if len(chunks) == 1 else b"".join(chunks)
 
 
 def _read_measured_file(
@@ -279,37 +327,60 @@ def _read_measured_file(
     *,
     encoding_errors: str,
 ) -> _MeasuredFile:
+    rel = _rel_posix(path, root)
     if override_texts is not None and path in override_texts:
         text = normalize_newlines(override_texts[path])
-        data = text.encode("utf-8")
         return _MeasuredFile(
             path=path,
-            rel=path.relative_to(root).as_posix(),
+            rel=rel,
             text=text,
-            size_bytes=len(data),
+            size_bytes=_utf8_size(text),
             is_binary=False,
         )
 
-    data = path.read_bytes()
-    is_binary = _is_likely_binary(data)
-    text = ""
-    if not is_binary:
-        try:
-            text = normalize_newlines(data.decode("utf-8", errors=encoding_errors))
-        except UnicodeDecodeError as e:
-            raise ValueError(
-                f"Failed to decode UTF-8 for {path.relative_to(root).as_posix()} "
-                f"(encoding_errors={encoding_errors})"
-            ) from e
+    # Raw descriptor reads skip the buffered-io wrapper and its size probing;
+    # fstat already says how much to read for the common small-file case.
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        size_hint = os.fstat(fd).st_size
+        if size_hint < _MMAP_MIN_BYTES:
+            data = _read_fd_bytes(fd, size_hint)
+            is_binary, text = _sniff_and_decode(
+                data, rel, encoding_errors=encoding_errors
+            )
+            size_bytes = len(data)
+        else:
+            # Large files are decoded straight from the page cache instead of
+            # first being copied into a bytes object of the same size.
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                is_binary, text = _sniff_and_decode(
+                    mm, rel, encoding_errors=encoding_errors
+                )
+                size_bytes = len(mm)
+    finally:
+        os.close(fd)
     return _MeasuredFile(
         path=path,
-        rel=path.relative_to(root).as_posix(),
+        rel=rel,
         text=text,
-        size_bytes=len(data),
+        size_bytes=size_bytes,
         is_binary=is_binary,
     )
 
 
+def _sniff_and_decode(
+    data: bytes | mmap.mmap, rel: str, *, encoding_errors: str
+) -> tuple[bool, str]:
+    if _is_likely_binary(data):
+        return True, ""
+    try:
+        return False, normalize_newlines(str(data, "utf-8", encoding_errors))
+    except UnicodeDecodeError as e:
+        raise ValueError(
+            f"Failed to decode UTF-8 for {rel} (encoding_errors={encoding_errors})"
+        ) from e
+
+
 def _measure_files(
     *,
     files: list[Path],
@@ -318,26 +389,75 @@ def _measure_files(
     override_texts: dict[Path, str] | None = None,
     encoding_errors: str = "replace",
 ) -> list[_MeasuredFile]:
-    worker_count = _resolve_worker_count(max_workers, len(files))
-    if worker_count == 1:
-        return [
-            _read_measured_file(
+    measured = _measure_file_batches(
+        files,
+        root=root,
+        max_workers=max_workers,
+        override_texts=override_texts,
+        encoding_errors=encoding_errors,
+        count_fn=None,
+    )
+    return [item for item, _tokens in measured]
+
+
+def _measure_and_count_files(
+    *,
+    files: list[Path],
+    root: Path,
+    max_workers: int,
+    count_fn: Callable[[str], int],
+    override_texts: dict[Path, str] | None = None,
+    encoding_errors: str = "replace",
+) -> tuple[list[_MeasuredFile], dict[str, int]]:
+    """Measure files and count tokens of the text ones in the same pool tasks.
+
+    Each worker tokenizes a file right after reading it, so reads overlap with
+    tokenization on other threads instead of running as two serial stages.
+    """
+    measured = _measure_file_batches(
+        files,
+        root=root,
+        max_workers=max_workers,
+        override_texts=override_texts,
+        encoding_errors=encoding_errors,
+        count_fn=count_fn,
+    )
+    return (
+        [item for item, _tokens in measured],
+        {item.rel: tokens for item, tokens in measured if not item.is_binary},
+    )
+
+
+def _measure_file_batches(
+    files: list[Path],
+    *,
+    root: Path,
+    max_workers: int,
+    override_texts: dict[Path, str] | None,
+    encoding_errors: str,
+    count_fn: Callable[[str], int] | None,
+) -> list[tuple[_MeasuredFile, int]]:
+    def measure_batch(batch: Sequence[Path]) -> list[tuple[_MeasuredFile, int]]:
+        out = []
+        for path in batch:
+            item = _read_measured_file(
                 path, root, override_texts, encoding_errors=encoding_errors
             )
-            for path in files
-        ]
+            tokens = 0
+            if count_fn is not None and not item.is_binary:
+                tokens = int(count_fn(item.text))
+            out.append((item, tokens))
+        return out
+
+    worker_count = _resolve_worker_count(max_workers, len(files))
+    if worker_count == 1:
+        return measure_batch(files)
+    # Most files are tiny, so one pool task per file spends more time in the
+    # executor queue than reading; hand each task a run of files instead.
+    batch_size = max(1, min(_MEASURE_BATCH_MAX, -(-len(files) // (worker_count * 4))))
+    batches = [files[i : i + batch_size] for i in range(0, len(files), batch_size)]
     with ThreadPoolExecutor(max_workers=worker_count) as pool:
-        return list(
-            pool.map(
-                lambda p: _read_measured_file(
-                    p,
-                    root,
-                    override_texts,
-                    encoding_errors=encoding_errors,
-                ),
-                files,
-            )
-        )
+        return list(chain.from_iterable(pool.map(measure_batch, batches)))
 
 
 def _count_tokens_parallel(
@@ -346,12 +466,35 @@ def _count_tokens_parallel(
     count_fn: Callable[[str], int],
     max_workers: int,
 ) -> dict[str, int]:
-    worker_count = _resolve_worker_count(max_workers, len(files))
+    # Identical texts (empty __init__.py files, vendored copies) share one
+    # tokenizer call; the dict keys on the text itself, so no hash collisions.
+    unique_texts = list(dict.fromkeys(f.text for f in files))
+    worker_count = _resolve_worker_count(max_workers, len(unique_texts), kind="cpu")
+    if worker_count == 1:
+        counts = {text: int(count_fn(text)) for text in unique_texts}
+    else:
+        with ThreadPoolExecutor(max_workers=worker_count) as pool:
+            counts = {
+                text: int(count)
+                for text, count in zip(
+                    unique_texts, pool.map(count_fn, unique_texts), strict=True
+                )
+            }
+    return {f.rel: counts[f.text] for f in files}
+
+
+def _write_split_parts(
+    parts: Sequence[tuple[Path, tuple[str, ...]]], *, max_workers: int
+) -> None:
+    # Split parts are independent files; write() releases the GIL, so threads
+    # overlap the open/write/close latency of many small parts.
+    worker_count = _resolve_worker_count(max_workers, len(parts))
     if worker_count == 1:
-        return {f.rel: int(count_fn(f.text)) for f in files}
+        for path, texts in parts:
+            _write_text_chunked(path, *texts)
+        return
     with ThreadPoolExecutor(max_workers=worker_count) as pool:
-        pairs = list(pool.map(lambda f: (f.rel, int(count_fn(f.text))), files))
-    return {k: v for k, v in pairs}
+        list(pool.map(lambda item: _write_text_chunked(item[0], *item[1]), parts))
 
 
 def _emit_budget_skip_warning(*, label: str, skipped: list[tuple[str, str]]) -> None:
@@ -417,52 +560,43 @@ def resolve_standalone_unpacker_output_path(
 
 
 def _print_selected_files(*, label: str, root: Path, selected: list[Path]) -> None:
-    print(
-        f"Debug: selected files for {label} ({len(selected)}):",
-        file=sys.stderr,
-    )
-    for path in selected:
-        print(f"  - {path.relative_to(root).as_posix()}", file=sys.stderr)
+    # Debug listings can cover thousands of files; write them in one call.
+    lines = [f"Debug: selected files for {label} ({len(selected)}):\n"]
+    lines.extend(f"  - {_rel_posix(path, root)}\n" for path in selected)
+    sys.stderr.write("".join(lines))
 
 
 def _print_skipped_files(*, label: str, skipped: list[tuple[str, str]]) -> None:
-    print(
-        f"Debug: skipped files for {label} ({len(skipped)}):",
-        file=sys.stderr,
-    )
-    for rel, reason in skipped:
-        print(f"  - {rel} ({reason})", file=sys.stderr)
+    lines = [f"Debug: skipped files for {label} ({len(skipped)}):\n"]
+    lines.extend(f"  - {rel} ({reason})\n" for rel, reason in skipped)
+    sys.stderr.write("".join(lines))
 
 
 def _print_effective_rules(*, label: str, root: Path, options: PackOptions) -> None:
     include = options.include or []
     exclude = DEFAULT_EXCLUDES + (options.exclude or [])
-    print(f"Debug: effective rules for {label}:", file=sys.stderr)
-    print(f"  include-source: {options.include_source}", file=sys.stderr)
-    print(
+    has_codecrateignore = (root / ".codecrateignore").exists()
+    lines = [
+        f"Debug: effective rules for {label}:",
+        f"  include-source: {options.include_source}",
         f"  include ({len(include)}): {', '.join(include) if include else '<none>'}",
-        file=sys.stderr,
-    )
-    print(
         f"  exclude ({len(exclude)}): {', '.join(exclude) if exclude else '<none>'}",
-        file=sys.stderr,
-    )
-    print(
-        "  ignore-files: "
-        f".gitignore={'yes' if options.respect_gitignore else 'no'}, "
-        f".codecrateignore={'yes' if (root / '.codecrateignore').exists() else 'no'}, "
-        f"gitignore_allow={len(options.gitignore_allow)}",
-        file=sys.stderr,
-    )
-    print(
-        "  safety: "
-        f"check={'on' if options.security_check else 'off'}, "
-        f"content_sniff={'on' if options.security_content_sniff else 'off'}, "
-        f"redaction={'on' if options.security_redaction else 'off'}, "
-        f"report={'on' if options.safety_report else 'off'}, "
-        f"path_rules(base={len(options.security_path_patterns)}, "
-        f"add={len(options.security_path_patterns_add)}, "
-        f"remove={len(options.security_path_patterns_remove)}), "
-        f"content_rules={len(options.security_content_patterns)}",
-        file=sys.stderr,
-    )
+        (
+            "  ignore-files: "
+            f".gitignore={'yes' if options.respect_gitignore else 'no'}, "
+            f".codecrateignore={'yes' if has_codecrateignore else 'no'}, "
+            f"gitignore_allow={len(options.gitignore_allow)}"
+        ),
+        (
+            "  safety: "
+            f"check={'on' if options.security_check else 'off'}, "
+            f"content_sniff={'on' if options.security_content_sniff else 'off'}, "
+            f"redaction={'on' if options.security_redaction else 'off'}, "
+            f"report={'on' if options.safety_report else 'off'}, "
+            f"path_rules(base={len(options.security_path_patterns)}, "
+            f"add={len(options.security_path_patterns_add)}, "
+            f"remove={len(options.security_path_patterns_remove)}), "
+            f"content_rules={len(options.security_content_patterns)}"
+        ),
+    ]
+    sys.stderr.write("\n".join(lines) + "\n")
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import argparse
-import importlib.metadata as importlib_metadata
+import sys
+from collections.abc import Callable, Sequence
+from functools import lru_cache
 from pathlib import Path
 
-from .cli_parser_pack import _add_pack_parser
-
 
+@lru_cache(maxsize=1)
 def _codecrate_version() -> str:
+    import importlib.metadata as importlib_metadata
+
     try:
         return importlib_metadata.version("codecrate")
     except importlib_metadata.PackageNotFoundError:
@@ -19,33 +22,90 @@ def _codecrate_version() -> str:
             return "0+unknown"
 
 
-def build_parser() -> argparse.ArgumentParser:
+class _VersionAction(argparse.Action):
+    """``--version`` that looks the version up only when the flag is used.
+
+    ``importlib.metadata`` costs more to import than building the parser, so
+    it should not be paid on every invocation just to pre-format this string.
+    """
+
+    def __init__(
+        self,
+        option_strings: Sequence[str],
+        dest: str = argparse.SUPPRESS,
+        default: str = argparse.SUPPRESS,
+        help: str = "show program's version number and exit",
+    ) -> None:
+        super().__init__(
+            option_strings=option_strings,
+            dest=dest,
+            default=default,
+            nargs=0,
+            help=help,
+        )
+
+    def __call__(
+        self,
+        parser: argparse.ArgumentParser,
+        namespace: argparse.Namespace,
+        values: object,
+        option_string: str | None = None,
+    ) -> None:
+        sys.stdout.write(f"codecrate {_codecrate_version()}\n")
+        parser.exit()
+
+
+_COMMANDS: tuple[tuple[str, str], ...] = (
+    ("pack", "Pack one or more repositories/directories into Markdown."),
+    ("unpack", "Reconstruct files from a packed context Markdown."),
+    ("patch", "Generate a diff-only patch Markdown from old pack + current repo."),
+    ("apply", "Apply a diff-only patch Markdown to a repo."),
+    (
+        "validate-pack",
+        "Validate a packed context Markdown (sha/markers/canonical consistency).",
+    ),
+    ("doctor", "Run repository diagnostics and capability checks."),
+    ("config", "Inspect resolved configuration values."),
+)
+
+
+def build_parser(argv: Sequence[str] | None = None) -> argparse.ArgumentParser:
+    """Build the top-level CLI parser.
+
+    With ``argv`` given, only the subcommand named by ``argv[0]`` gets its
+    arguments registered; every other subcommand is a help-only stub so the
+    top-level usage still lists it. ``argv=None`` builds every subcommand.
+    """
     p = argparse.ArgumentParser(
         prog="codecrate",
         description="Pack/unpack/patch/apply for repositories  (Python + text files).",
     )
-    p.add_argument(
-        "--version",
-        action="version",
-        version=f"codecrate {_codecrate_version()}",
-    )
+    p.add_argument("--version", action=_VersionAction)
     sub = p.add_subparsers(dest="cmd", required=True)
-    _add_pack_parser(sub)
-    _add_unpack_parser(sub)
-    _add_patch_parser(sub)
-    _add_apply_parser(sub)
-    _add_validate_parser(sub)
-    _add_doctor_parser(sub)
-    _add_config_parser(sub)
+    selected = None if argv is None else (argv[0] if argv else "")
+    for name, help_text in _COMMANDS:
+        command = sub.add_parser(name, help=help_text)
+        if selected is None or selected == name:
+            _command_args_builder(name)(command)
     return p
 
 
-def _add_unpack_parser(
-    subparsers: argparse._SubParsersAction[argparse.ArgumentParser],
-) -> None:
-    unpack = subparsers.add_parser(
-        "unpack", help="Reconstruct files from a packed context Markdown."
-    )
+def _command_args_builder(name: str) -> Callable[[argparse.ArgumentParser], None]:
+    if name == "pack":
+        from .cli_parser_pack import _add_pack_args
+
+        return _add_pack_args
+    return {
+        "unpack": _add_unpack_args,
+        "patch": _add_patch_args,
+        "apply": _add_apply_args,
+        "validate-pack": _add_validate_args,
+        "doctor": _add_doctor_args,
+        "config": _add_config_args,
+    }[name]
+
+
+def _add_unpack_args(unpack: argparse.ArgumentParser) -> None:
     unpack.add_argument(
         "markdown",
         type=Path,
@@ -81,13 +141,7 @@ def _add_unpack_parser(
     )
 
 
-def _add_patch_parser(
-    subparsers: argparse._SubParsersAction[argparse.ArgumentParser],
-) -> None:
-    patch = subparsers.add_parser(
-        "patch",
-        help="Generate a diff-only patch Markdown from old pack + current repo.",
-    )
+def _add_patch_args(patch: argparse.ArgumentParser) -> None:
     patch.add_argument(
         "old_markdown", type=Path, help="Older packed Markdown (baseline)"
     )
@@ -113,12 +167,7 @@ def _add_patch_parser(
     )
 
 
-def _add_apply_parser(
-    subparsers: argparse._SubParsersAction[argparse.ArgumentParser],
-) -> None:
-    apply = subparsers.add_parser(
-        "apply", help="Apply a diff-only patch Markdown to a repo."
-    )
+def _add_apply_args(apply: argparse.ArgumentParser) -> None:
     apply.add_argument(
         "patch_markdown", type=Path, help="Patch Markdown containing ```diff blocks"
     )
@@ -153,13 +202,7 @@ def _add_apply_parser(
     )
 
 
-def _add_validate_parser(
-    subparsers: argparse._SubParsersAction[argparse.ArgumentParser],
-) -> None:
-    vpack = subparsers.add_parser(
-        "validate-pack",
-        help="Validate a packed context Markdown (sha/markers/canonical consistency).",
-    )
+def _add_validate_args(vpack: argparse.ArgumentParser) -> None:
     vpack.add_argument(
         "markdown",
         type=Path,
@@ -209,12 +252,7 @@ def _add_validate_parser(
     )
 
 
-def _add_doctor_parser(
-    subparsers: argparse._SubParsersAction[argparse.ArgumentParser],
-) -> None:
-    doctor = subparsers.add_parser(
-        "doctor", help="Run repository diagnostics and capability checks."
-    )
+def _add_doctor_args(doctor: argparse.ArgumentParser) -> None:
     doctor.add_argument(
         "root",
         type=Path,
@@ -224,12 +262,7 @@ def _add_doctor_parser(
     )
 
 
-def _add_config_parser(
-    subparsers: argparse._SubParsersAction[argparse.ArgumentParser],
-) -> None:
-    config = subparsers.add_parser(
-        "config", help="Inspect resolved configuration values."
-    )
+def _add_config_args(config: argparse.ArgumentParser) -> None:
     config_sub = config.add_subparsers(dest="config_cmd", required=True)
     config_show = config_sub.add_parser(
         "show", help="Show effective configuration for a repository root."
@@ -360,7 +360,28 @@ def _add_pack_budget_args(pack: argparse.ArgumentParser) -> None:
         "--max-workers",
         type=int,
         default=None,
-        help="Max worker threads for IO/parsing/token counting (<=0 uses auto).",
+        help=(
+            "Max worker threads for IO/parsing/token counting; also caps "
+            "parallel repo packing (<=0 uses auto)."
+        ),
+    )
+    pack.add_argument(
+        "--cache",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help=(
+            "Reuse rendered output from a previous run when options and file "
+            "contents are unchanged (default: off)."
+        ),
+    )
+    pack.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help=(
+            "Directory for --cache entries "
+            "(default: $XDG_CACHE_HOME/codecrate/packs or ~/.cache/codecrate/packs)."
+        ),
     )
 
 
@@ -557,12 +578,7 @@ def _add_pack_markdown_args(pack: argparse.ArgumentParser) -> None:
     )
 
 
-def _add_pack_parser(
-    subparsers: argparse._SubParsersAction[argparse.ArgumentParser],
-) -> None:
-    pack = subparsers.add_parser(
-        "pack", help="Pack one or more repositories/directories into Markdown."
-    )
+def _add_pack_args(pack: argparse.ArgumentParser) -> None:
     _add_pack_inputs(pack)
     _add_pack_output_args(pack)
     _add_pack_safety_args(pack)
@@ -572,4 +588,4 @@ def _add_pack_parser(
     _add_pack_markdown_args(pack)
 
 
-__all__ = ["_add_pack_parser"]
+__all__ = ["_add_pack_args"]
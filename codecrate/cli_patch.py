@@ -4,13 +4,13 @@ from argparse import ArgumentParser, Namespace
 from typing import Literal
 
 from .cli_shared import (
-    _extract_diff_blocks,
-    _extract_patch_metadata,
     _is_no_manifest_error,
     _prefix_repo_header,
     _raise_no_manifest_error,
     _read_text_with_policy,
+    _scan_patch_fences,
     _verify_patch_baseline,
+    _write_text_chunked,
 )
 from .config import load_config
 from .diffgen import generate_patch_markdown
@@ -66,7 +66,7 @@ def run_patch_command(parser: ArgumentParser, args: Namespace) -> None:
             patch_md.rstrip() + "\n",
             selected_label,
         )
-    args.output.write_text(patch_md, encoding="utf-8")
+    _write_text_chunked(args.output, patch_md)
     print(f"Wrote {args.output}")
 
 
@@ -97,9 +97,8 @@ def run_apply_command(parser: ArgumentParser, args: Namespace) -> None:
             "# Repository sections"
         )
 
-    diff_text = _extract_diff_blocks(md_text)
+    diff_text, patch_meta = _scan_patch_fences(md_text)
     diffs = parse_unified_diff(diff_text)
-    patch_meta = _extract_patch_metadata(md_text)
     baseline_policy: Literal["auto", "require", "ignore"] = "auto"
     if args.check_baseline:
         baseline_policy = "require"
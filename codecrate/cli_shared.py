@@ -3,75 +3,173 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+import mmap
+import os
+import re
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Literal
 
-from .fences import is_fence_close, parse_fence_open
 from .formats import FENCE_PATCH_META, MISSING_MANIFEST_ERROR
 from .udiff import normalize_newlines
 
 
+def _repo_header(label: str) -> str:
+    return f"# Repository: {label}\n\n"
+
+
 def _prefix_repo_header(text: str, label: str) -> str:
-    header = f"# Repository: {label}\n\n"
+    header = _repo_header(label)
     if text.startswith(header):
         return text
     return header + text
 
 
+_DIFF_FENCE_OPEN_RE = re.compile(
+    r"^[ \t]*(?P<fence>`{3,})[ \t]*(?P<info>diff)(?:[ \t][^\r\n]*)?\r?$",
+    re.MULTILINE,
+)
+_PATCH_FENCE_OPEN_RE = re.compile(
+    r"^[ \t]*(?P<fence>`{3,})[ \t]*"
+    rf"(?P<info>diff|{re.escape(FENCE_PATCH_META)})"
+    r"(?:[ \t][^\r\n]*)?\r?$",
+    re.MULTILINE,
+)
+
+
+def _scan_patch_fences(
+    md_text: str, *, metadata: bool = True
+) -> tuple[str, dict[str, object] | None]:
+    """
+    Collect diff fences and the first patch-metadata fence in one pass.
+
+    Returns the concatenated unified diff and the parsed metadata (or None).
+    """
+    out: list[str] = []
+    meta: dict[str, object] | None = None
+    opener = _PATCH_FENCE_OPEN_RE if metadata else _DIFF_FENCE_OPEN_RE
+    pos = 0
+    while True:
+        opened = opener.search(md_text, pos)
+        if opened is None:
+            break
+        body_start = opened.end() + 1
+        closed = re.compile(
+            rf"^[ \t]*{opened.group('fence')}[ \t]*\r?$", re.MULTILINE
+        ).search(md_text, body_start)
+        body = md_text[body_start : len(md_text) if closed is None else closed.start()]
+        if opened.group("info") == FENCE_PATCH_META:
+            meta = _parse_patch_metadata(body)
+            # Only the first metadata fence counts; later ones are plain text.
+            opener = _DIFF_FENCE_OPEN_RE
+        elif body:
+            body = body.replace("\r\n", "\n")
+            out.append(body if body.endswith("\n") else body + "\n")
+        if closed is None:
+            break
+        pos = closed.end()
+    return "".join(out) or "\n", meta
+
+
+def _parse_patch_metadata(body: str) -> dict[str, object] | None:
+    try:
+        parsed = json.loads(body)
+    except json.JSONDecodeError:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
 def _extract_diff_blocks(md_text: str) -> str:
     """
     Extract only diff fences from markdown and concatenate to a unified diff string.
     """
-    lines = md_text.splitlines()
-    out: list[str] = []
-    i = 0
-    while i < len(lines):
-        opened = parse_fence_open(lines[i])
-        if opened is not None and opened[1] == "diff":
-            fence = opened[0]
-            i += 1
-            while i < len(lines) and not is_fence_close(lines[i], fence):
-                out.append(lines[i])
-                i += 1
-        i += 1
-    return "\n".join(out) + "\n"
+    return _scan_patch_fences(md_text, metadata=False)[0]
 
 
 def _extract_patch_metadata(md_text: str) -> dict[str, object] | None:
-    lines = md_text.splitlines()
-    i = 0
-    while i < len(lines):
-        opened = parse_fence_open(lines[i])
-        if opened is not None and opened[1] == FENCE_PATCH_META:
-            fence = opened[0]
-            i += 1
-            body: list[str] = []
-            while i < len(lines) and not is_fence_close(lines[i], fence):
-                body.append(lines[i])
-                i += 1
-            try:
-                parsed = json.loads("\n".join(body))
-            except json.JSONDecodeError:
-                return None
-            return parsed if isinstance(parsed, dict) else None
-        i += 1
-    return None
+    return _scan_patch_fences(md_text)[1]
+
+
+_MMAP_READ_MIN_BYTES = 256 * 1024
 
 
 def _read_text_with_policy(path: Path, *, encoding_errors: str) -> str:
     try:
-        return path.read_text(encoding="utf-8", errors=encoding_errors)
+        if path.stat().st_size < _MMAP_READ_MIN_BYTES:
+            return path.read_text(encoding="utf-8", errors=encoding_errors)
+        # Large packs decode straight from the page cache, skipping the bytes
+        # copy read() makes; newlines are then translated like read_text does.
+        with (
+            path.open("rb") as fh,
+            mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        ):
+            text = str(mm, "utf-8", encoding_errors)
     except UnicodeDecodeError as e:
         raise ValueError(
             f"Failed to decode UTF-8 for {path} (encoding_errors={encoding_errors})"
         ) from e
+    return normalize_newlines(text) if "\r" in text else text
+
+
+_WRITE_CHUNK_CHARS = 1 << 20
+
+
+def _write_text_chunked(path: Path, *texts: str) -> None:
+    """Write ``texts`` back to back as UTF-8, one chunk at a time.
+
+    ``Path.write_text`` encodes the whole string before writing, which doubles
+    peak memory for large packs; this bounds the encoded copy to one chunk and
+    lets callers pass a prefix without concatenating it onto the body first.
+    """
+    with path.open("w", encoding="utf-8") as fh:
+        for text in texts:
+            for start in range(0, len(text), _WRITE_CHUNK_CHARS):
+                fh.write(text[start : start + _WRITE_CHUNK_CHARS])
+
+
+def _available_cpu_count() -> int:
+    # Honour CPU affinity (taskset, container cpusets) where the OS exposes it.
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
 
 
 def _sha256_text(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
+def _baseline_mismatch(
+    path: Path, expected_sha: str, *, encoding_errors: str
+) -> str | None:
+    # Reading directly (instead of exists() then read) classifies missing files
+    # with the same open() call that fetches the bytes.
+    try:
+        data = path.read_bytes()
+    except (FileNotFoundError, NotADirectoryError):
+        return "missing; expected baseline file"
+    # Baseline hashes cover LF-normalized UTF-8 text. Files already in that form
+    # hash identically from their raw bytes, and CR/LF bytes never occur inside
+    # multi-byte UTF-8 sequences, so newlines can be normalized on the bytes.
+    # Only decode (to apply encoding_errors) when both comparisons fail.
+    if hashlib.sha256(data).hexdigest() == expected_sha:
+        return None
+    if b"\r" in data:
+        normalized = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        if hashlib.sha256(normalized).hexdigest() == expected_sha:
+            return None
+    try:
+        text = data.decode("utf-8", errors=encoding_errors)
+    except UnicodeDecodeError as e:
+        raise ValueError(
+            f"Failed to decode UTF-8 for {path} (encoding_errors={encoding_errors})"
+        ) from e
+    if _sha256_text(normalize_newlines(text)) == expected_sha:
+        return None
+    return "baseline sha mismatch"
+
+
 def _verify_patch_baseline(
     *,
     root: Path,
@@ -100,33 +198,38 @@ def _verify_patch_baseline(
             )
         return
 
-    mismatches: list[str] = []
     root_resolved = root.resolve()
+    # (rel, path, expected sha); None marks an add that must not exist yet.
+    jobs: list[tuple[str, Path, str | None]] = []
     for fd in diffs:
         rel = getattr(fd, "path", "")
         op = getattr(fd, "op", "")
         if not isinstance(rel, str) or not rel:
             continue
         expected_sha = baseline.get(rel)
-        path = root_resolved / rel
-
         if op == "add":
-            if path.exists():
-                mismatches.append(f"{rel} (expected absent before add)")
-            continue
-
-        if not isinstance(expected_sha, str) or not expected_sha:
-            continue
-        if not path.exists():
-            mismatches.append(f"{rel} (missing; expected baseline file)")
-            continue
-
-        disk_text = normalize_newlines(
-            _read_text_with_policy(path, encoding_errors=encoding_errors)
-        )
-        disk_sha = _sha256_text(disk_text)
-        if disk_sha != expected_sha:
-            mismatches.append(f"{rel} (baseline sha mismatch)")
+            jobs.append((rel, root_resolved / rel, None))
+        elif isinstance(expected_sha, str) and expected_sha:
+            jobs.append((rel, root_resolved / rel, expected_sha))
+
+    def check(job: tuple[str, Path, str | None]) -> str | None:
+        _rel, path, expected = job
+        if expected is None:
+            return "expected absent before add" if path.exists() else None
+        return _baseline_mismatch(path, expected, encoding_errors=encoding_errors)
+
+    # Files are independent and hashing releases the GIL, so overlap the reads.
+    worker_count = min(32, _available_cpu_count() * 4, len(jobs))
+    if worker_count <= 1:
+        reasons = [check(job) for job in jobs]
+    else:
+        with ThreadPoolExecutor(max_workers=worker_count) as pool:
+            reasons = list(pool.map(check, jobs))
+    mismatches = [
+        f"{rel} ({reason})"
+        for (rel, _path, _expected), reason in zip(jobs, reasons, strict=True)
+        if reason is not None
+    ]
 
     if mismatches:
         preview = ", ".join(mismatches[:5])
@@ -138,88 +241,134 @@ def _verify_patch_baseline(
         )
 
 
+# Ordered (needles, hint) rules: the first rule whose needles all occur in the
+# message wins, so more specific rules must precede broader ones.
+_VALIDATION_HINTS: tuple[tuple[tuple[str, ...], str], ...] = (
+    (
+        ("expected exactly one codecrate-manifest block",),
+        "ensure each repo section contains exactly one ```codecrate-manifest block",
+    ),
+    (
+        ("Cross-repo anchor collision",),
+        "make anchor ids unique across sections (or regenerate with codecrate pack)",
+    ),
+    (
+        ("Machine header checksum mismatch",),
+        "manifest content changed; regenerate the pack to refresh checksum",
+    ),
+    (
+        ("Machine header", "missing"),
+        "regenerate pack so machine header and manifest are emitted together",
+    ),
+    (
+        ("codecrate-machine-header block",),
+        "ensure exactly one machine header fence is present in the pack",
+    ),
+    (
+        ("Unsupported manifest format",),
+        "regenerate pack with a supported codecrate version",
+    ),
+    (
+        ("id_format_version",),
+        "pack format metadata is incompatible; regenerate with current codecrate",
+    ),
+    (
+        ("marker_format_version",),
+        "pack format metadata is incompatible; regenerate with current codecrate",
+    ),
+    (
+        ("Missing stubbed file block",),
+        "restore missing file block under ## Files or regenerate the pack",
+    ),
+    (
+        ("Manifest file missing from file blocks",),
+        "ensure every manifest path has a matching ### `<path>` block in ## Files",
+    ),
+    (
+        ("File block not present in manifest",),
+        "remove extra file blocks or regenerate manifest from source",
+    ),
+    (
+        ("Duplicate file block",),
+        "keep only one file block per path under ## Files",
+    ),
+    (
+        ("Missing canonical source",),
+        "restore the missing Function Library entry for the listed id",
+    ),
+    (
+        ("Orphan function-library entry",),
+        "remove unused Function Library entry or add matching manifest def",
+    ),
+    (
+        ("Missing FUNC marker",),
+        "ensure stub contains a marker like ...  # ↪ FUNC:v1:<ID>",
+    ),
+    (
+        ("Unresolved marker mapping",),
+        "ensure stub contains a marker like ...  # ↪ FUNC:v1:<ID>",
+    ),
+    (
+        ("Repo-scope marker collision",),
+        "ensure each stub marker id maps to a single definition occurrence",
+    ),
+    (
+        ("sha mismatch",),
+        "pack content was edited after generation; regenerate from source files",
+    ),
+    (
+        ("failed to parse repository pack",),
+        "verify markdown fences/manifest JSON are intact",
+    ),
+)
+
+# Every rule needs its first needle, so one scan rejects messages without a hint.
+_VALIDATION_HINT_PREFILTER_RE = re.compile(
+    "|".join(re.escape(needles[0]) for needles, _hint in _VALIDATION_HINTS)
+)
+
+
 def _validation_hint(message: str) -> str | None:
-    if "expected exactly one codecrate-manifest block" in message:
-        return (
-            "ensure each repo section contains exactly one ```codecrate-manifest block"
-        )
-    if "Cross-repo anchor collision" in message:
-        return (
-            "make anchor ids unique across sections (or regenerate with codecrate pack)"
-        )
-    if "Machine header checksum mismatch" in message:
-        return "manifest content changed; regenerate the pack to refresh checksum"
-    if "Machine header" in message and "missing" in message:
-        return "regenerate pack so machine header and manifest are emitted together"
-    if "codecrate-machine-header block" in message:
-        return "ensure exactly one machine header fence is present in the pack"
-    if "Unsupported manifest format" in message:
-        return "regenerate pack with a supported codecrate version"
-    if "id_format_version" in message or "marker_format_version" in message:
-        return "pack format metadata is incompatible; regenerate with current codecrate"
-    if "Missing stubbed file block" in message:
-        return "restore missing file block under ## Files or regenerate the pack"
-    if "Manifest file missing from file blocks" in message:
-        return (
-            "ensure every manifest path has a matching ### `<path>` block in ## Files"
-        )
-    if "File block not present in manifest" in message:
-        return "remove extra file blocks or regenerate manifest from source"
-    if "Duplicate file block" in message:
-        return "keep only one file block per path under ## Files"
-    if "Missing canonical source" in message:
-        return "restore the missing Function Library entry for the listed id"
-    if "Orphan function-library entry" in message:
-        return "remove unused Function Library entry or add matching manifest def"
-    if "Missing FUNC marker" in message or "Unresolved marker mapping" in message:
-        return "ensure stub contains a marker like ...  # ↪ FUNC:v1:<ID>"
-    if "Repo-scope marker collision" in message:
-        return "ensure each stub marker id maps to a single definition occurrence"
-    if "sha mismatch" in message:
-        return "pack content was edited after generation; regenerate from source files"
-    if "failed to parse repository pack" in message:
-        return "verify markdown fences/manifest JSON are intact"
+    if _VALIDATION_HINT_PREFILTER_RE.search(message) is None:
+        return None
+    for needles, hint in _VALIDATION_HINTS:
+        if all(needle in message for needle in needles):
+            return hint
     return None
 
 
 def _split_validation_scope(message: str) -> tuple[str, str]:
-    if message.startswith("repo '") and ": " in message:
-        scope, rest = message.split(": ", 1)
-        return scope, rest
+    if message.startswith("repo '"):
+        scope, sep, rest = message.partition(": ")
+        if sep:
+            return scope, rest
     return "global", message
 
 
-def _print_grouped_validation_report(report: object) -> None:
-    warnings = list(getattr(report, "warnings", []))
-    errors = list(getattr(report, "errors", []))
+def _grouped_validation_lines(title: str, messages: list[str]) -> list[str]:
+    if not messages:
+        return []
+    by_scope: dict[str, list[str]] = {}
+    for msg in messages:
+        scope, detail = _split_validation_scope(msg)
+        by_scope.setdefault(scope, []).append(detail)
+    lines = [f"{title}:"]
+    for scope, details in by_scope.items():
+        lines.append(f"- [{scope}]")
+        for detail in details:
+            lines.append(f"  - {detail}")
+            hint = _validation_hint(detail)
+            if hint:
+                lines.append(f"    hint: {hint}")
+    return lines
 
-    if warnings:
-        print("Warnings:")
-        by_scope: dict[str, list[str]] = {}
-        for msg in warnings:
-            scope, detail = _split_validation_scope(msg)
-            by_scope.setdefault(scope, []).append(detail)
-        for scope, msgs in by_scope.items():
-            print(f"- [{scope}]")
-            for detail in msgs:
-                print(f"  - {detail}")
-                hint = _validation_hint(detail)
-                if hint:
-                    print(f"    hint: {hint}")
-
-    if errors:
-        print("Errors:")
-        by_scope_err: dict[str, list[str]] = {}
-        for msg in errors:
-            scope, detail = _split_validation_scope(msg)
-            by_scope_err.setdefault(scope, []).append(detail)
-        for scope, msgs in by_scope_err.items():
-            print(f"- [{scope}]")
-            for detail in msgs:
-                print(f"  - {detail}")
-                hint = _validation_hint(detail)
-                if hint:
-                    print(f"    hint: {hint}")
+
+def _print_grouped_validation_report(report: object) -> None:
+    lines = _grouped_validation_lines(
+        "Warnings", list(getattr(report, "warnings", []))
+    ) + _grouped_validation_lines("Errors", list(getattr(report, "errors", [])))
+    if lines:
+        print("\n".join(lines))
 
 
 def _validation_report_json(report: object) -> str:
@@ -288,24 +437,6 @@ def _validation_report_json_with_policy(
     return json.dumps(payload, indent=2, sort_keys=False)
 
 
-def _print_top_level_help(parser: argparse.ArgumentParser) -> None:
-    parser.print_help()
-    print()
-    print("Quick start examples:")
-    print("  codecrate pack . -o context.md")
-    print("  codecrate unpack context.md -o out/ --check-machine-header --strict")
-    print("  codecrate patch baseline.md . -o changes.md")
-    print("  codecrate apply changes.md .")
-    print("  codecrate validate-pack context.md --strict")
-    print("  codecrate doctor .")
-    print("  codecrate config show . --effective")
-    print()
-    print("Explicit-file mode notes:")
-    print("  --stdin/--stdin0 treat stdin paths as the candidate set.")
-    print("  Include globs are bypassed; exclude + ignore rules still apply.")
-    print("  Outside-root and missing files are skipped (see --print-skipped).")
-
-
 _NO_MANIFEST_HELP = (
     "packed markdown is missing a Manifest section; re-run `codecrate pack` "
     "without `--no-manifest` (or use `--manifest`)."
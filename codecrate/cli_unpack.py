@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from argparse import ArgumentParser, Namespace
+
+from .cli_shared import (
+    _is_no_manifest_error,
+    _raise_no_manifest_error,
+    _read_text_with_policy,
+)
+from .unpacker import unpack_to_dir
+
+
+def run_unpack_command(parser: ArgumentParser, args: Namespace) -> None:
+    unpack_encoding_errors = args.encoding_errors or "replace"
+    try:
+        md_text = _read_text_with_policy(
+            args.markdown,
+            encoding_errors=unpack_encoding_errors,
+        )
+    except ValueError as e:
+        parser.error(f"unpack: {e}")
+    try:
+        unpack_to_dir(
+            md_text,
+            args.out_dir,
+            strict=bool(args.strict),
+            fail_on_warning=bool(args.fail_on_warning),
+            check_machine_header=bool(args.check_machine_header),
+        )
+    except ValueError as e:
+        if _is_no_manifest_error(e):
+            _raise_no_manifest_error(parser, command_name="unpack")
+        raise
+    print(f"Unpacked into {args.out_dir}")
@@ -1,41 +1,10 @@
 from __future__ import annotations
 
+import copy
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, cast
 
-from .config import (
-    PYPROJECT_FILENAME,
-    Config,
-    ConfigValueProvenance,
-    ConfigWarning,
-    EncodingErrorsValue,
-    IncludePresetValue,
-    IndexJsonModeValue,
-    LayoutValue,
-    LoadedConfig,
-    LocatorSpaceValue,
-    NavModeValue,
-    ProfileValue,
-    SymbolBackendValue,
-    _config_source_name,
-    _default_provenance,
-    _extract_section,
-    _find_config_path,
-    _load_bool_value,
-    _load_focus_list,
-    _load_int_value,
-    _load_non_empty_string,
-    _load_optional_bool_value,
-    _load_optional_output_value,
-    _load_optional_string_choice,
-    _load_string_choice,
-    _load_string_list,
-    _raw_section_value,
-    _record_provenance,
-    _warn_unknown_keys,
-    include_patterns_for_preset,
-)
-
 try:
     import tomllib  # py311+
 except ModuleNotFoundError:  # pragma: no cover
@@ -581,6 +550,23 @@ def _load_focus_and_runtime_config(
     )
 
 
+@lru_cache(maxsize=64)
+def _parse_toml_file(path: Path, mtime_ns: int, size: int) -> dict[str, Any]:
+    # mtime_ns/size are part of the cache key so edits are picked up. A rewrite
+    # that keeps the size and lands within the filesystem's mtime granularity
+    # (up to seconds on some filesystems) still hits the old entry and serves
+    # the previous config until the file changes again.
+    return tomllib.loads(path.read_text(encoding="utf-8"))
+
+
+def _parse_config_file(path: Path, mtime_ns: int, size: int) -> dict[str, Any]:
+    data = _parse_toml_file(path, mtime_ns, size)
+    section = _extract_section(data, from_pyproject=path.name == PYPROJECT_FILENAME)
+    # The cached parse is shared between calls; hand out a private copy so
+    # callers that mutate nested lists/tables cannot change later loads.
+    return copy.deepcopy(section)
+
+
 def load_config_details(root: Path) -> LoadedConfig:
     cfg_path = _find_config_path(root)
     cfg = Config()
@@ -595,8 +581,8 @@ def load_config_details(root: Path) -> LoadedConfig:
             selected_path=None,
         )
 
-    data = tomllib.loads(cfg_path.read_text(encoding="utf-8"))
-    section = _extract_section(data, from_pyproject=cfg_path.name == PYPROJECT_FILENAME)
+    stat = cfg_path.stat()
+    section = _parse_config_file(cfg_path, stat.st_mtime_ns, stat.st_size)
     _warn_unknown_keys(section, warnings)
 
     _load_output_config(
@@ -651,4 +637,40 @@ def load_config(root: Path) -> Config:
     return load_config_details(root).config
 
 
+# Imported last: config re-exports load_config from this module at its end,
+# so importing config_loader first must define everything above before
+# config runs. Every use above happens at call time.
+from .config import (
+    PYPROJECT_FILENAME,
+    Config,
+    ConfigValueProvenance,
+    ConfigWarning,
+    EncodingErrorsValue,
+    IncludePresetValue,
+    IndexJsonModeValue,
+    LayoutValue,
+    LoadedConfig,
+    LocatorSpaceValue,
+    NavModeValue,
+    ProfileValue,
+    SymbolBackendValue,
+    _config_source_name,
+    _default_provenance,
+    _extract_section,
+    _find_config_path,
+    _load_bool_value,
+    _load_focus_list,
+    _load_int_value,
+    _load_non_empty_string,
+    _load_optional_bool_value,
+    _load_optional_output_value,
+    _load_optional_string_choice,
+    _load_string_choice,
+    _load_string_list,
+    _raw_section_value,
+    _record_provenance,
+    _warn_unknown_keys,
+    include_patterns_for_preset,
+)
+
 __all__ = ["load_config", "load_config_details", "load_config_with_warnings"]
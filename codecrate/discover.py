@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+import os
+import re
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 
 import pathspec
@@ -34,6 +37,13 @@ class Discovery:
     skipped: list[DiscoverySkip] = field(default_factory=list)
 
 
+@lru_cache(maxsize=32)
+def _compile_patterns(patterns: tuple[str, ...]) -> pathspec.PathSpec:
+    # Include/exclude specs depend only on the pattern list, so repos packed
+    # with the same options (and repeated discoveries) share one compiled spec.
+    return pathspec.PathSpec.from_lines("gitignore", patterns)
+
+
 def _load_ignore_lines(root: Path, filename: str) -> list[str]:
     p = root / filename
     if not p.exists():
@@ -80,6 +90,80 @@ def _is_confined_to_root(path: Path, root: Path) -> bool:
     return True
 
 
+_DIR_OR_END_SUFFIX = "(?:/|$)"
+
+
+def _directory_prune_regexes(spec: pathspec.PathSpec) -> list[re.Pattern[str]]:
+    """Return regexes that, when they match ``"dir/"``, match every file below it.
+
+    Only negation-free specs qualify, since a negation could re-include a file
+    inside a matched directory. A pattern qualifies when its compiled regex is
+    a pure prefix match (no end anchor), which then also matches any longer
+    path; a trailing ``(?:/|$)`` is narrowed to ``/`` for directory names.
+    Patterns such as ``b/*`` (``^b/[^/]+/?$``) match direct children only and
+    are left to the per-file check.
+    """
+    if any(pattern.include is False for pattern in spec.patterns):
+        return []
+    out: list[re.Pattern[str]] = []
+    for pattern in spec.patterns:
+        regex = getattr(pattern, "regex", None)
+        if pattern.include is not True or regex is None:
+            continue
+        source = regex.pattern
+        if not isinstance(source, str):
+            continue
+        if source.endswith(_DIR_OR_END_SUFFIX):
+            source = source[: -len(_DIR_OR_END_SUFFIX)] + "/"
+        if any(token in source for token in ("$", "\\Z", "(?=", "(?!", "(?<")):
+            continue
+        out.append(re.compile(source, regex.flags))
+    return out
+
+
+def _walk_tree_files(
+    root: Path, prune: Sequence[re.Pattern[str]] = ()
+) -> Iterator[tuple[Path, str, bool]]:
+    """Yield ``(path, rel_posix, is_symlink)`` for every file below ``root``.
+
+    Matches ``root.rglob("*")`` filtered by ``is_file()``: symlinked directories
+    are not descended into and unreadable directories are skipped. Directory
+    entries carry their type, so no per-file stat is needed, and relative paths
+    are sliced from the entry path instead of computed with ``relative_to``.
+    Directories whose ``"rel/"`` path matches any regex in ``prune`` (see
+    ``_directory_prune_regexes``) are not descended into at all.
+    """
+    prefix_len = len(os.path.join(os.fspath(root), ""))
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if prune:
+                        rel_dir = entry.path[prefix_len:]
+                        if os.sep != "/":
+                            rel_dir = rel_dir.replace(os.sep, "/")
+                        rel_dir += "/"
+                        if any(regex.match(rel_dir) for regex in prune):
+                            continue
+                    stack.append(entry.path)
+                    continue
+                if not entry.is_file():
+                    continue
+                is_symlink = entry.is_symlink()
+            except OSError:
+                continue
+            rel = entry.path[prefix_len:]
+            if os.sep != "/":
+                rel = rel.replace(os.sep, "/")
+            yield Path(entry.path), rel, is_symlink
+
+
 def _resolve_explicit_files(
     root: Path, files: Sequence[Path]
 ) -> tuple[list[Path], list[DiscoverySkip]]:
@@ -147,25 +231,28 @@ def discover_files(
         respect_gitignore=respect_gitignore,
         gitignore_allow=gitignore_allow,
     )
-    inc = pathspec.PathSpec.from_lines("gitignore", include or ["**/*.py"])
-
-    effective_exclude = DEFAULT_EXCLUDES + (exclude or [])
-    exc = pathspec.PathSpec.from_lines("gitignore", effective_exclude)
+    inc = _compile_patterns(tuple(include or ["**/*.py"]))
+    exc = _compile_patterns((*DEFAULT_EXCLUDES, *(exclude or [])))
 
     out: list[Path] = []
     skipped: list[DiscoverySkip] = []
+    candidates: Iterator[tuple[Path, str, bool]]
     if explicit_files is None:
-        candidates = [p for p in root.rglob("*") if p.is_file()]
+        # Ignored and excluded directories (.git, .venv, node_modules, ...) are
+        # skipped whole instead of walking and rejecting every file inside.
+        prune = _directory_prune_regexes(ignore) + _directory_prune_regexes(exc)
+        candidates = _walk_tree_files(root, prune)
         apply_inc = True
     else:
-        candidates, skipped = _resolve_explicit_files(root, explicit_files)
+        explicit, skipped = _resolve_explicit_files(root, explicit_files)
+        candidates = ((p, p.relative_to(root).as_posix(), True) for p in explicit)
         apply_inc = False
 
-    for p in candidates:
-        if not _is_confined_to_root(p, root):
+    for p, rel_s, may_escape in candidates:
+        # Walked regular files sit below the resolved root through real
+        # directories, so only symlinks (and explicit files) need resolving.
+        if may_escape and not _is_confined_to_root(p, root):
             continue
-        rel = p.relative_to(root)
-        rel_s = rel.as_posix()
 
         if ignore.match_file(rel_s):
             if explicit_files is not None:
@@ -198,10 +285,8 @@ def discover_python_files(
         respect_gitignore=respect_gitignore,
         gitignore_allow=gitignore_allow,
     )
-    inc = pathspec.PathSpec.from_lines("gitignore", include or ["**/*.py"])
-
-    effective_exclude = DEFAULT_EXCLUDES + (exclude or [])
-    exc = pathspec.PathSpec.from_lines("gitignore", effective_exclude)
+    inc = _compile_patterns(tuple(include or ["**/*.py"]))
+    exc = _compile_patterns((*DEFAULT_EXCLUDES, *(exclude or [])))
 
     out: list[Path] = []
     for p in root.rglob("*.py"):
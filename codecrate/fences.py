@@ -20,7 +20,11 @@ def choose_backtick_fence(text: str, *, min_len: int = 3) -> str:
 
 
 def parse_fence_open(line: str) -> tuple[str, str] | None:
-    m = _FENCE_OPEN_RE.match(line.strip())
+    stripped = line.strip()
+    # Nearly every line is not a fence; reject those without entering the regex.
+    if not stripped.startswith("```"):
+        return None
+    m = _FENCE_OPEN_RE.match(stripped)
     if not m:
         return None
     return m.group("fence"), m.group("info")
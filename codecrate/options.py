@@ -7,7 +7,7 @@ from typing import Any, cast
 from .config import Config, include_patterns_for_preset
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PackOptions:
     include: list[str] | None
     include_source: str
@@ -88,14 +88,12 @@ def resolve_encoding_errors(cfg: Config, cli_value: str | None) -> str:
     if cli_value is not None:
         value = str(cli_value).strip().lower()
     else:
-        value = str(getattr(cfg, "encoding_errors", "replace")).strip().lower()
+        value = str(cfg.encoding_errors).strip().lower()
     return value if value in {"replace", "strict"} else "replace"
 
 
 def resolve_profile(cfg: Config, cli_value: str | None) -> str:
-    value = (
-        cli_value if cli_value is not None else str(getattr(cfg, "profile", "human"))
-    )
+    value = cli_value if cli_value is not None else str(cfg.profile)
     norm = str(value).strip().lower()
     return (
         norm
@@ -127,7 +125,7 @@ def resolve_index_json_mode(
         value = str(cli_value).strip().lower()
         return value if value in {"full", "compact", "minimal", "normalized"} else None
 
-    cfg_value = getattr(cfg, "index_json_mode", None)
+    cfg_value = cfg.index_json_mode
     if isinstance(cfg_value, str):
         value = cfg_value.strip().lower()
         if value in {"full", "compact", "minimal", "normalized"}:
@@ -150,8 +148,8 @@ def resolve_emit_standalone_unpacker(
         return bool(cli_value)
     if profile == "portable-agent":
         return True
-    return bool(getattr(cfg, "emit_standalone_unpacker", False)) or (
-        getattr(cfg, "standalone_unpacker_output", None) is not None
+    return bool(cfg.emit_standalone_unpacker) or (
+        cfg.standalone_unpacker_output is not None
     )
 
 
@@ -166,7 +164,7 @@ def resolve_locator_space(
     if cli_value is not None:
         value = str(cli_value).strip().lower()
     else:
-        value = str(getattr(cfg, "locator_space", "auto")).strip().lower()
+        value = str(cfg.locator_space).strip().lower()
     if value not in {"auto", "markdown", "reconstructed", "dual"}:
         value = "auto"
     if value == "auto":
@@ -221,20 +219,20 @@ def _resolve_output_targets(
         include_manifest = cfg.manifest if profile == "human" else True
     else:
         include_manifest = bool(args.manifest)
-    manifest_json_output = getattr(cfg, "manifest_json_output", None)
-    index_json_output = getattr(cfg, "index_json_output", None)
-    standalone_unpacker_output = getattr(cfg, "standalone_unpacker_output", None)
+    manifest_json_output = cfg.manifest_json_output
+    index_json_output = cfg.index_json_output
+    standalone_unpacker_output = cfg.standalone_unpacker_output
     if args.index_json is not None:
         index_json_enabled = True
     elif bool(getattr(args, "no_index_json", False)):
         index_json_enabled = False
-    elif getattr(cfg, "index_json_enabled", None) is not None:
+    elif cfg.index_json_enabled is not None:
         index_json_enabled = bool(cfg.index_json_enabled)
     elif getattr(args, "index_json_mode", None) is not None:
         index_json_enabled = True
     elif index_json_output is not None:
         index_json_enabled = True
-    elif getattr(cfg, "index_json_mode", None) is not None:
+    elif cfg.index_json_mode is not None:
         index_json_enabled = True
     else:
         index_json_enabled = profile in {
@@ -266,12 +264,12 @@ def _resolve_sidecar_and_markdown_options(
     portable_agent_trimmed = profile == "portable-agent"
     analysis_metadata = _resolve_optional_bool(
         getattr(args, "analysis_metadata", None),
-        getattr(cfg, "analysis_metadata", None),
+        cfg.analysis_metadata,
         default=default_analysis_metadata,
     )
     index_json_pretty = _resolve_optional_bool(
         getattr(args, "index_json_pretty", None),
-        getattr(cfg, "index_json_pretty", None),
+        cfg.index_json_pretty,
         default=not (
             index_json_mode == "minimal"
             or profile == "lean-agent"
@@ -280,12 +278,12 @@ def _resolve_sidecar_and_markdown_options(
     )
     index_json_include_lookup = _resolve_optional_bool(
         getattr(args, "index_json_lookup", None),
-        getattr(cfg, "index_json_include_lookup", None),
+        cfg.index_json_include_lookup,
         default=index_json_mode != "minimal",
     )
     index_json_include_symbol_index_lines = _resolve_optional_bool(
         getattr(args, "index_json_symbol_index_lines", None),
-        getattr(cfg, "index_json_include_symbol_index_lines", None),
+        cfg.index_json_include_symbol_index_lines,
         default=index_json_mode != "minimal",
     )
     default_compact_analysis = analysis_metadata and not (
@@ -306,7 +304,7 @@ def _resolve_sidecar_and_markdown_options(
         "index_json_include_symbol_index_lines": index_json_include_symbol_index_lines,
         "index_json_include_graph": _resolve_optional_bool(
             getattr(args, "index_json_graph", None),
-            getattr(cfg, "index_json_include_graph", None),
+            cfg.index_json_include_graph,
             default=analysis_metadata and not portable_agent_trimmed,
         ),
         "index_json_include_test_links": _resolve_analysis_toggle(
@@ -330,57 +328,57 @@ def _resolve_sidecar_and_markdown_options(
         ),
         "index_json_include_semantic": _resolve_optional_bool(
             getattr(args, "index_json_semantic", None),
-            getattr(cfg, "index_json_include_semantic", None),
+            cfg.index_json_include_semantic,
             default=default_compact_analysis,
         ),
         "index_json_include_purpose_text": _resolve_optional_bool(
             getattr(args, "index_json_purpose_text", None),
-            getattr(cfg, "index_json_include_purpose_text", None),
+            cfg.index_json_include_purpose_text,
             default=default_compact_analysis,
         ),
         "index_json_include_symbol_locators": _resolve_optional_bool(
             getattr(args, "index_json_symbol_locators", None),
-            getattr(cfg, "index_json_include_symbol_locators", None),
+            cfg.index_json_include_symbol_locators,
             default=profile != "lean-agent",
         ),
         "index_json_include_symbol_references": _resolve_optional_bool(
             getattr(args, "index_json_symbol_references", None),
-            getattr(cfg, "index_json_include_symbol_references", None),
+            cfg.index_json_include_symbol_references,
             default=default_compact_analysis and not portable_agent_trimmed,
         ),
         "index_json_include_file_summaries": _resolve_optional_bool(
             getattr(args, "index_json_file_summaries", None),
-            getattr(cfg, "index_json_include_file_summaries", None),
+            cfg.index_json_include_file_summaries,
             default=default_compact_analysis,
         ),
         "index_json_include_relationships": _resolve_optional_bool(
             getattr(args, "index_json_relationships", None),
-            getattr(cfg, "index_json_include_relationships", None),
+            cfg.index_json_include_relationships,
             default=default_compact_analysis,
         ),
         "markdown_include_repository_guide": _resolve_optional_bool(
             getattr(args, "markdown_repository_guide", None),
-            getattr(cfg, "markdown_include_repository_guide", None),
+            cfg.markdown_include_repository_guide,
             default=analysis_metadata and profile != "lean-agent",
         ),
         "markdown_include_symbol_index": _resolve_optional_bool(
             getattr(args, "markdown_symbol_index", None),
-            getattr(cfg, "markdown_include_symbol_index", None),
+            cfg.markdown_include_symbol_index,
             default=True,
         ),
         "markdown_include_directory_tree": _resolve_optional_bool(
             getattr(args, "markdown_directory_tree", None),
-            getattr(cfg, "markdown_include_directory_tree", None),
+            cfg.markdown_include_directory_tree,
             default=True,
         ),
         "markdown_include_environment_setup": _resolve_optional_bool(
             getattr(args, "markdown_environment_setup", None),
-            getattr(cfg, "markdown_include_environment_setup", None),
+            cfg.markdown_include_environment_setup,
             default=profile != "lean-agent",
         ),
         "markdown_include_how_to_use": _resolve_optional_bool(
             getattr(args, "markdown_how_to_use", None),
-            getattr(cfg, "markdown_include_how_to_use", None),
+            cfg.markdown_include_how_to_use,
             default=profile != "lean-agent",
         ),
     }
@@ -388,40 +386,40 @@ def _resolve_sidecar_and_markdown_options(
 
 def _resolve_focus_options(cfg: Config, args: argparse.Namespace) -> dict[str, object]:
     include_import_neighbors = (
-        int(getattr(cfg, "include_import_neighbors", 0) or 0)
+        int(cfg.include_import_neighbors or 0)
         if getattr(args, "include_import_neighbors", None) is None
         else int(args.include_import_neighbors or 0)
     )
     include_reverse_import_neighbors = (
-        int(getattr(cfg, "include_reverse_import_neighbors", 0) or 0)
+        int(cfg.include_reverse_import_neighbors or 0)
         if getattr(args, "include_reverse_import_neighbors", None) is None
         else int(args.include_reverse_import_neighbors or 0)
     )
     return {
         "focus_file": (
-            list(getattr(cfg, "focus_file", []))
+            list(cfg.focus_file)
             if getattr(args, "focus_file", None) is None
             else [str(item) for item in args.focus_file]
         ),
         "focus_symbol": (
-            list(getattr(cfg, "focus_symbol", []))
+            list(cfg.focus_symbol)
             if getattr(args, "focus_symbol", None) is None
             else [str(item) for item in args.focus_symbol]
         ),
         "include_import_neighbors": max(0, include_import_neighbors),
         "include_reverse_import_neighbors": max(0, include_reverse_import_neighbors),
         "include_same_package": (
-            bool(getattr(cfg, "include_same_package", False))
+            bool(cfg.include_same_package)
             if getattr(args, "include_same_package", None) is None
             else bool(args.include_same_package)
         ),
         "include_entrypoints": (
-            bool(getattr(cfg, "include_entrypoints", False))
+            bool(cfg.include_entrypoints)
             if getattr(args, "include_entrypoints", None) is None
             else bool(args.include_entrypoints)
         ),
         "include_tests": (
-            bool(getattr(cfg, "include_tests", False))
+            bool(cfg.include_tests)
             if getattr(args, "include_tests", None) is None
             else bool(args.include_tests)
         ),
@@ -435,44 +433,44 @@ def _resolve_safety_options(cfg: Config, args: argparse.Namespace) -> dict[str,
             if args.respect_gitignore is None
             else bool(args.respect_gitignore)
         ),
-        "gitignore_allow": list(getattr(cfg, "gitignore_allow", [])),
+        "gitignore_allow": list(cfg.gitignore_allow),
         "security_check": (
-            bool(getattr(cfg, "security_check", True))
+            bool(cfg.security_check)
             if args.security_check is None
             else bool(args.security_check)
         ),
         "security_content_sniff": (
-            bool(getattr(cfg, "security_content_sniff", False))
+            bool(cfg.security_content_sniff)
             if args.security_content_sniff is None
             else bool(args.security_content_sniff)
         ),
         "security_redaction": (
-            bool(getattr(cfg, "security_redaction", False))
+            bool(cfg.security_redaction)
             if args.security_redaction is None
             else bool(args.security_redaction)
         ),
         "safety_report": (
-            bool(getattr(cfg, "safety_report", False))
+            bool(cfg.safety_report)
             if args.safety_report is None
             else bool(args.safety_report)
         ),
         "security_path_patterns": (
-            list(getattr(cfg, "security_path_patterns", []))
+            list(cfg.security_path_patterns)
             if args.security_path_pattern is None
             else [str(p) for p in args.security_path_pattern]
         ),
         "security_path_patterns_add": (
-            list(getattr(cfg, "security_path_patterns_add", []))
+            list(cfg.security_path_patterns_add)
             if args.security_path_pattern_add is None
             else [str(p) for p in args.security_path_pattern_add]
         ),
         "security_path_patterns_remove": (
-            list(getattr(cfg, "security_path_patterns_remove", []))
+            list(cfg.security_path_patterns_remove)
             if args.security_path_pattern_remove is None
             else [str(p) for p in args.security_path_pattern_remove]
         ),
         "security_content_patterns": (
-            list(getattr(cfg, "security_content_patterns", []))
+            list(cfg.security_content_patterns)
             if args.security_content_pattern is None
             else [str(p) for p in args.security_content_pattern]
         ),
@@ -482,14 +480,15 @@ def _resolve_safety_options(cfg: Config, args: argparse.Namespace) -> dict[str,
 def _resolve_render_options(
     cfg: Config, args: argparse.Namespace, *, profile: str
 ) -> dict[str, object]:
+    # argparse `choices` and the config loader already validate and lowercase
+    # layout values, so they are used as-is here.
     if args.layout is not None:
-        layout = str(args.layout).strip().lower()
+        layout = args.layout
     else:
-        cfg_layout = str(getattr(cfg, "layout", "auto")).strip().lower()
         layout = (
             "full"
-            if profile in {"portable", "portable-agent"} and cfg_layout == "auto"
-            else cfg_layout
+            if profile in {"portable", "portable-agent"} and cfg.layout == "auto"
+            else cfg.layout
         )
     nav_mode = (
         str(args.nav_mode).strip().lower()
@@ -497,7 +496,7 @@ def _resolve_render_options(
         else (
             "compact"
             if profile in {"agent", "lean-agent", "portable-agent"}
-            else str(getattr(cfg, "nav_mode", "auto")).strip().lower()
+            else str(cfg.nav_mode).strip().lower()
         )
     )
     return {
@@ -508,12 +507,12 @@ def _resolve_render_options(
             else int(args.split_max_chars or 0)
         ),
         "split_strict": (
-            bool(getattr(cfg, "split_strict", False))
+            bool(cfg.split_strict)
             if args.split_strict is None
             else bool(args.split_strict)
         ),
         "split_allow_cut_files": (
-            bool(getattr(cfg, "split_allow_cut_files", False))
+            bool(cfg.split_allow_cut_files)
             if args.split_allow_cut_files is None
             else bool(args.split_allow_cut_files)
         ),
@@ -522,21 +521,28 @@ def _resolve_render_options(
         "symbol_backend": (
             str(args.symbol_backend).strip().lower()
             if args.symbol_backend is not None
-            else str(getattr(cfg, "symbol_backend", "auto")).strip().lower()
+            else str(cfg.symbol_backend).strip().lower()
         ),
         "encoding_errors": resolve_encoding_errors(cfg, args.encoding_errors),
     }
 
 
+def resolve_max_workers(cfg: Config, args: argparse.Namespace) -> int:
+    """Return the worker cap; ``--max-workers`` wins over the config value."""
+    if args.max_workers is None:
+        return int(cfg.max_workers or 0)
+    return int(args.max_workers or 0)
+
+
 def _resolve_budget_options(cfg: Config, args: argparse.Namespace) -> dict[str, object]:
     token_count_encoding = (
         str(args.token_count_encoding).strip()
         if args.token_count_encoding is not None
-        else str(getattr(cfg, "token_count_encoding", "o200k_base")).strip()
+        else str(cfg.token_count_encoding).strip()
     ) or "o200k_base"
-    cfg_tree = bool(getattr(cfg, "token_count_tree", False))
-    cfg_thr = int(getattr(cfg, "token_count_tree_threshold", 0) or 0)
-    cfg_top = int(getattr(cfg, "top_files_len", 5) or 5)
+    cfg_tree = bool(cfg.token_count_tree)
+    cfg_thr = int(cfg.token_count_tree_threshold or 0)
+    cfg_top = int(cfg.top_files_len or 5)
     token_count_tree = cfg_tree
     token_count_tree_threshold = cfg_thr
     if args.token_count_tree is not None:
@@ -561,35 +567,31 @@ def _resolve_budget_options(cfg: Config, args: argparse.Namespace) -> dict[str,
         "top_files_len": top_files_len,
         "token_count_encoding": token_count_encoding,
         "file_summary": (
-            bool(getattr(cfg, "file_summary", True))
+            bool(cfg.file_summary)
             if args.file_summary is None
             else bool(args.file_summary)
         ),
         "max_file_bytes": (
-            int(getattr(cfg, "max_file_bytes", 0) or 0)
+            int(cfg.max_file_bytes or 0)
             if args.max_file_bytes is None
             else int(args.max_file_bytes or 0)
         ),
         "max_total_bytes": (
-            int(getattr(cfg, "max_total_bytes", 0) or 0)
+            int(cfg.max_total_bytes or 0)
             if args.max_total_bytes is None
             else int(args.max_total_bytes or 0)
         ),
         "max_file_tokens": (
-            int(getattr(cfg, "max_file_tokens", 0) or 0)
+            int(cfg.max_file_tokens or 0)
             if args.max_file_tokens is None
             else int(args.max_file_tokens or 0)
         ),
         "max_total_tokens": (
-            int(getattr(cfg, "max_total_tokens", 0) or 0)
+            int(cfg.max_total_tokens or 0)
             if args.max_total_tokens is None
             else int(args.max_total_tokens or 0)
         ),
-        "max_workers": (
-            int(getattr(cfg, "max_workers", 0) or 0)
-            if args.max_workers is None
-            else int(args.max_workers or 0)
-        ),
+        "max_workers": resolve_max_workers(cfg, args),
     }
 
 
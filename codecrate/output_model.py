@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -42,7 +42,7 @@ class MarkdownUsageContext:
     include_machine_header: bool = True
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PackRun:
     root: Path
     label: str
@@ -69,3 +69,5 @@ class PackRun:
     manifest: dict[str, Any]
     manifest_sha256: str
     focus_selection: FocusSelectionResult | None = None
+    skipped_for_budget: list[tuple[str, str]] = field(default_factory=list)
+    token_counter_error: str = ""
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import re
+import stat
+import time
+import warnings
+from collections.abc import Iterable
+from pathlib import Path
+
+from .output_model import PackRun
+
+PACK_CACHE_SUFFIX = ".pickle"
+PACK_ALIAS_SUFFIX = ".key"
+# Entries are evicted least-recently-used first once the cache grows past this.
+PACK_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Leftover temp files older than this belong to writers that died mid-store.
+_STALE_TMP_SECONDS = 3600
+
+_KEY_RE = re.compile(r"[0-9a-f]{40}")
+
+_UNPICKLE_ERRORS = (
+    pickle.UnpicklingError,
+    EOFError,
+    AttributeError,
+    ImportError,
+    TypeError,
+    ValueError,
+)
+
+
+def default_pack_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME", "").strip()
+    cache_home = Path(base) if base else Path.home() / ".cache"
+    return cache_home / "codecrate" / "packs"
+
+
+def pack_cache_key(parts: Iterable[str]) -> str:
+    hasher = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        hasher.update(part.encode("utf-8", errors="surrogatepass"))
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def _open_private_entry(path: Path) -> bytes | None:
+    # Entries are pickles, and unpickling runs code chosen by whoever wrote
+    # the file, so only entries this user owns and nobody else can rewrite
+    # are trusted. fstat on the open descriptor avoids a stat/open race.
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    except OSError:
+        return None
+    try:
+        st = os.fstat(fd)
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        getuid = getattr(os, "getuid", None)
+        if getuid is not None and (
+            st.st_uid != getuid() or st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+        ):
+            return None
+        with os.fdopen(fd, "rb") as fh:
+            fd = -1
+            return fh.read()
+    except OSError:
+        return None
+    finally:
+        if fd >= 0:
+            os.close(fd)
+
+
+def load_cache_alias(cache_dir: Path, alias: str) -> str | None:
+    """Return the entry key an alias (e.g. a stat-metadata key) points at."""
+    data = _open_private_entry(cache_dir / f"{alias}{PACK_ALIAS_SUFFIX}")
+    if data is None:
+        return None
+    key = data.decode("ascii", errors="replace").strip()
+    return key if _KEY_RE.fullmatch(key) else None
+
+
+def store_cache_alias(cache_dir: Path, alias: str, key: str) -> None:
+    _write_private_entry(cache_dir / f"{alias}{PACK_ALIAS_SUFFIX}", key.encode())
+
+
+def load_cached_pack_run(cache_dir: Path, key: str) -> PackRun | None:
+    data = _open_private_entry(cache_dir / f"{key}{PACK_CACHE_SUFFIX}")
+    if data is None:
+        return None
+    try:
+        run = pickle.loads(data)
+    except _UNPICKLE_ERRORS:
+        # Stale entries written by another codecrate version are simply misses.
+        return None
+    if not isinstance(run, PackRun):
+        return None
+    # Bump the mtime so prune_pack_cache evicts least-recently-used entries.
+    try:
+        os.utime(cache_dir / f"{key}{PACK_CACHE_SUFFIX}")
+    except OSError:
+        pass
+    return run
+
+
+def store_cached_pack_run(cache_dir: Path, key: str, run: PackRun) -> None:
+    path = cache_dir / f"{key}{PACK_CACHE_SUFFIX}"
+    _write_private_entry(path, pickle.dumps(run, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def prune_pack_cache(cache_dir: Path, *, max_bytes: int = PACK_CACHE_MAX_BYTES) -> None:
+    """Bound the cache directory after a store.
+
+    Evicts the least recently used entries until the rest fit in
+    ``max_bytes`` (the newest entry is always kept), drops aliases whose
+    entry is gone or that a newer alias to the same entry supersedes, and
+    removes temp files left behind by interrupted writes. Deleting the
+    directory clears the cache entirely.
+    """
+    now = time.time()
+    entries: list[tuple[float, int, Path]] = []
+    aliases: list[tuple[float, Path]] = []
+    try:
+        children = list(cache_dir.iterdir())
+    except OSError:
+        return
+    for path in children:
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        if path.name.endswith(".tmp"):
+            if now - st.st_mtime > _STALE_TMP_SECONDS:
+                path.unlink(missing_ok=True)
+        elif path.suffix == PACK_CACHE_SUFFIX:
+            entries.append((st.st_mtime, st.st_size, path))
+        elif path.suffix == PACK_ALIAS_SUFFIX:
+            aliases.append((st.st_mtime, path))
+
+    kept: set[str] = set()
+    total = 0
+    for _mtime, size, path in sorted(entries, key=lambda item: item[0], reverse=True):
+        total += size
+        if kept and total > max_bytes:
+            path.unlink(missing_ok=True)
+        else:
+            kept.add(path.stem)
+
+    targeted: set[str] = set()
+    for _mtime, path in sorted(aliases, key=lambda item: item[0], reverse=True):
+        target = load_cache_alias(cache_dir, path.stem)
+        if target is None or target not in kept or target in targeted:
+            path.unlink(missing_ok=True)
+        else:
+            targeted.add(target)
+
+
+def _write_private_entry(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd = os.open(
+            tmp_path,
+            os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0),
+            0o600,
+        )
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        tmp_path.unlink(missing_ok=True)
+        warnings.warn(
+            f"pack cache write failed for {path}: {e}",
+            RuntimeWarning,
+            stacklevel=3,
+        )
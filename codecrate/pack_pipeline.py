@@ -1,36 +1,52 @@
 from __future__ import annotations
 
+import os
 import sys
+import time
 from argparse import ArgumentParser, Namespace
-from collections.abc import Callable
+from collections.abc import Callable, Iterator, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 
 from .analysis_metadata import build_entrypoints, build_import_edges, build_test_links
 from .cli_pack_helpers import (
+    _available_cpu_count,
     _count_tokens_parallel,
     _emit_binary_skip_warning,
     _emit_budget_skip_warning,
     _emit_safety_warning,
+    _measure_and_count_files,
     _measure_files,
     _MeasuredFile,
     _pack_has_effective_dedupe,
     _print_effective_rules,
     _print_selected_files,
     _print_skipped_files,
+    _rel_posix,
     _resolve_effective_nav_mode,
     _resolve_output_path,
     _unique_label,
     _unique_slug,
+    _utf8_size,
 )
-from .config import Config, load_config
+from .cli_parser import _codecrate_version, build_parser
+from .config import load_config
 from .discover import Discovery, discover_files
 from .focus import FocusSelectionResult, build_focus_selection
 from .manifest import manifest_sha256, to_manifest
 from .markdown import render_markdown_result
 from .model import PackResult
-from .options import PackOptions, resolve_pack_options
+from .options import PackOptions, resolve_max_workers, resolve_pack_options
 from .output_model import MarkdownUsageContext, PackRun
+from .pack_cache import (
+    default_pack_cache_dir,
+    load_cache_alias,
+    load_cached_pack_run,
+    pack_cache_key,
+    prune_pack_cache,
+    store_cache_alias,
+    store_cached_pack_run,
+)
 from .packer import pack_repo
 from .security import SafetyFinding, apply_safety_filters, build_ruleset
 from .tokens import TokenCounter, approx_token_count
@@ -59,12 +75,9 @@ def _display_sidecar_filename(path: Path, *, base_dir: Path) -> str:
 
 def _build_usage_context(
     *,
-    cfg: Config,
-    args: Namespace,
-    root: Path,
+    output_path: Path,
     options: PackOptions,
 ) -> MarkdownUsageContext:
-    output_path = _resolve_output_path(cfg, args, root)
     output_dir = output_path.parent
     standalone_path: Path | None = None
     if options.emit_standalone_unpacker:
@@ -118,12 +131,25 @@ class _PreparedPackFiles:
     file_bytes: dict[str, int]
     token_backend: str
     count_tokens: Callable[[str], int]
+    token_counter_error: str
+    # Thread cap for this run's pools (0 = auto), see _pack_thread_budget.
+    max_workers: int
+
+
+def _resolve_roots(paths: Sequence[Path]) -> list[Path]:
+    # realpath() lstat()s every component; resolve each distinct argument once
+    # so repeated --repo values (and later labelling) reuse the same result.
+    resolved: dict[Path, Path] = {}
+    for path in paths:
+        if path not in resolved:
+            resolved[path] = path.resolve()
+    return [resolved[path] for path in paths]
 
 
 def _resolve_pack_roots_and_stdin(
     parser: ArgumentParser, args: Namespace
 ) -> tuple[list[Path], list[Path] | None]:
-    positional_roots = [root.resolve() for root in (args.root or [])]
+    positional_roots = _resolve_roots(args.root or [])
     has_focus_options = bool(getattr(args, "focus_file", None)) or bool(
         getattr(args, "focus_symbol", None)
     )
@@ -149,7 +175,7 @@ def _resolve_pack_roots_and_stdin(
             parser.error(
                 "pack: focus options require a single ROOT (do not use --repo)"
             )
-        roots = [r.resolve() for r in args.repo]
+        roots = _resolve_roots(args.repo)
     else:
         if not positional_roots:
             parser.error("pack: ROOT is required when --repo is not used")
@@ -180,15 +206,13 @@ def _resolve_pack_roots_and_stdin(
     return roots, stdin_files
 
 
-def _discover_and_filter_files(
-    parser: ArgumentParser,
+def _discover_pack_files(
     *,
-    label: str,
     root: Path,
     options: PackOptions,
     stdin_files: list[Path] | None,
-) -> _DiscoveryState:
-    disc = discover_files(
+) -> Discovery:
+    return discover_files(
         root=root,
         include=options.include,
         exclude=options.exclude,
@@ -196,6 +220,14 @@ def _discover_and_filter_files(
         gitignore_allow=options.gitignore_allow,
         explicit_files=stdin_files,
     )
+
+
+def _filter_discovered_files(
+    parser: ArgumentParser,
+    *,
+    disc: Discovery,
+    options: PackOptions,
+) -> _DiscoveryState:
     safe_files = disc.files
     skipped: list[SafetyFinding] = []
     safety_findings: list[SafetyFinding] = []
@@ -232,7 +264,10 @@ def _discover_and_filter_files(
     )
 
 
-def _build_token_counter(options: PackOptions) -> tuple[str, Callable[[str], int]]:
+def _build_token_counter(
+    options: PackOptions,
+) -> tuple[str, Callable[[str], int], str]:
+    """Return ``(backend, count_fn, error)``; ``error`` is set on fallback."""
     needs_token_counts = bool(
         options.token_report
         or options.max_file_tokens > 0
@@ -241,7 +276,7 @@ def _build_token_counter(options: PackOptions) -> tuple[str, Callable[[str], int
     token_backend = ""
     count_tokens = approx_token_count
     if not needs_token_counts:
-        return token_backend, count_tokens
+        return token_backend, count_tokens, ""
 
     try:
         counter = TokenCounter(options.token_count_encoding)
@@ -249,14 +284,28 @@ def _build_token_counter(options: PackOptions) -> tuple[str, Callable[[str], int
         counter.count("")
         count_tokens = counter.count
     except Exception as e:
-        token_backend = "approx"
-        count_tokens = approx_token_count
+        return "approx", approx_token_count, str(e)
+    return token_backend, count_tokens, ""
+
+
+def _emit_measure_warnings(
+    *,
+    label: str,
+    root: Path,
+    token_counter_error: str,
+    binary_rels: list[str],
+    safety_findings: list[SafetyFinding],
+    skipped_for_budget: list[tuple[str, str]],
+) -> None:
+    if token_counter_error:
         print(
-            f"Warning: token counting disabled ({e}); "
+            f"Warning: token counting disabled ({token_counter_error}); "
             "falling back to approximate counts.",
             file=sys.stderr,
         )
-    return token_backend, count_tokens
+    _emit_binary_skip_warning(label=label, skipped=binary_rels)
+    _emit_safety_warning(label=label, root=root, findings=safety_findings)
+    _emit_budget_skip_warning(label=label, skipped=skipped_for_budget)
 
 
 def _measure_and_apply_budgets(
@@ -265,22 +314,44 @@ def _measure_and_apply_budgets(
     label: str,
     options: PackOptions,
     discovery_state: _DiscoveryState,
+    max_workers: int,
+    emit_warnings: bool = True,
 ) -> _PreparedPackFiles:
-    token_backend, count_tokens = _build_token_counter(options)
+    """Read, sniff and budget the discovered files.
+
+    With ``emit_warnings=False`` (process-pool workers) the warnings are only
+    recorded, and the parent prints them from the ``PackRun`` in input order;
+    they are still printed here if the run fails a total budget.
+    """
+    token_backend, count_tokens, token_counter_error = _build_token_counter(options)
+    raw_token_counts: dict[str, int] = {}
     try:
-        measured_files = _measure_files(
-            files=discovery_state.safe_files,
-            root=discovery_state.discovery.root,
-            max_workers=options.max_workers,
-            override_texts=discovery_state.redacted_files,
-            encoding_errors=options.encoding_errors,
-        )
+        if options.max_file_tokens > 0 or options.max_total_tokens > 0:
+            measured_files, raw_token_counts = _measure_and_count_files(
+                files=discovery_state.safe_files,
+                root=discovery_state.discovery.root,
+                max_workers=max_workers,
+                count_fn=count_tokens,
+                override_texts=discovery_state.redacted_files,
+                encoding_errors=options.encoding_errors,
+            )
+        else:
+            measured_files = _measure_files(
+                files=discovery_state.safe_files,
+                root=discovery_state.discovery.root,
+                max_workers=max_workers,
+                override_texts=discovery_state.redacted_files,
+                encoding_errors=options.encoding_errors,
+            )
     except ValueError as e:
         parser.error(f"pack: {e}")
 
     skipped = list(discovery_state.skipped)
     safety_findings = list(discovery_state.safety_findings)
-    binary_measured = [m for m in measured_files if m.is_binary]
+    binary_measured: list[_MeasuredFile] = []
+    text_measured: list[_MeasuredFile] = []
+    for measured in measured_files:
+        (binary_measured if measured.is_binary else text_measured).append(measured)
     if binary_measured:
         binary_skipped = [
             SafetyFinding(path=m.path, reason="binary", action="skipped")
@@ -288,57 +359,52 @@ def _measure_and_apply_budgets(
         ]
         skipped.extend(binary_skipped)
         safety_findings.extend(binary_skipped)
-        _emit_binary_skip_warning(
-            label=label,
-            skipped=[m.rel for m in binary_measured],
-        )
-    measured_files = [m for m in measured_files if not m.is_binary]
 
-    _emit_safety_warning(
-        label=label,
-        root=discovery_state.discovery.root,
-        findings=safety_findings,
-    )
-
-    raw_token_counts: dict[str, int] = {}
-    if options.max_file_tokens > 0 or options.max_total_tokens > 0:
-        raw_token_counts = _count_tokens_parallel(
-            files=measured_files,
-            count_fn=count_tokens,
-            max_workers=options.max_workers,
-        )
-
-    kept_measured = []
+    kept_measured: list[_MeasuredFile] = []
     skipped_for_budget: list[tuple[str, str]] = []
-    for measured in measured_files:
+    file_texts: dict[Path, str] = {}
+    file_bytes: dict[str, int] = {}
+    total_bytes = 0
+    total_tokens_raw = 0
+    for measured in text_measured:
         if options.max_file_bytes > 0 and measured.size_bytes > options.max_file_bytes:
             skipped_for_budget.append((measured.rel, f"bytes>{options.max_file_bytes}"))
             continue
-        if options.max_file_tokens > 0:
-            token_count = raw_token_counts.get(measured.rel, 0)
-            if token_count > options.max_file_tokens:
-                skipped_for_budget.append(
-                    (measured.rel, f"tokens>{options.max_file_tokens}")
-                )
-                continue
+        token_count = raw_token_counts.get(measured.rel, 0)
+        if options.max_file_tokens > 0 and token_count > options.max_file_tokens:
+            skipped_for_budget.append(
+                (measured.rel, f"tokens>{options.max_file_tokens}")
+            )
+            continue
         kept_measured.append(measured)
+        file_texts[measured.path] = measured.text
+        file_bytes[measured.rel] = measured.size_bytes
+        total_bytes += measured.size_bytes
+        total_tokens_raw += token_count
 
-    _emit_budget_skip_warning(label=label, skipped=skipped_for_budget)
-
-    total_bytes = sum(m.size_bytes for m in kept_measured)
+    failure = ""
     if options.max_total_bytes > 0 and total_bytes > options.max_total_bytes:
-        raise SystemExit(
+        failure = (
             f"pack: total bytes {total_bytes} exceed max_total_bytes "
             f"{options.max_total_bytes} for {label}"
         )
+    elif options.max_total_tokens > 0 and total_tokens_raw > options.max_total_tokens:
+        failure = (
+            f"pack: total tokens {total_tokens_raw} exceed "
+            f"max_total_tokens {options.max_total_tokens} for {label}"
+        )
 
-    if options.max_total_tokens > 0:
-        total_tokens_raw = sum(raw_token_counts.get(m.rel, 0) for m in kept_measured)
-        if total_tokens_raw > options.max_total_tokens:
-            raise SystemExit(
-                f"pack: total tokens {total_tokens_raw} exceed "
-                f"max_total_tokens {options.max_total_tokens} for {label}"
-            )
+    if emit_warnings or failure:
+        _emit_measure_warnings(
+            label=label,
+            root=discovery_state.discovery.root,
+            token_counter_error=token_counter_error,
+            binary_rels=[m.rel for m in binary_measured],
+            safety_findings=safety_findings,
+            skipped_for_budget=skipped_for_budget,
+        )
+    if failure:
+        raise SystemExit(failure)
 
     return _PreparedPackFiles(
         kept_measured=kept_measured,
@@ -346,10 +412,12 @@ def _measure_and_apply_budgets(
         safety_findings=safety_findings,
         skipped_for_budget=skipped_for_budget,
         raw_token_counts=raw_token_counts,
-        file_texts={m.path: m.text for m in kept_measured},
-        file_bytes={m.rel: m.size_bytes for m in kept_measured},
+        file_texts=file_texts,
+        file_bytes=file_bytes,
         token_backend=token_backend,
         count_tokens=count_tokens,
+        token_counter_error=token_counter_error,
+        max_workers=max_workers,
     )
 
 
@@ -587,7 +655,7 @@ def _apply_focus_selection(
         dedupe=False,
         symbol_backend=options.symbol_backend,
         file_texts=prepared_files.file_texts,
-        max_workers=options.max_workers,
+        max_workers=prepared_files.max_workers,
         encoding_errors=options.encoding_errors,
     )
 
@@ -596,10 +664,7 @@ def _apply_focus_selection(
             root=root,
             pack=analysis_pack,
             options=options,
-            available_paths={
-                item.path.relative_to(root).as_posix()
-                for item in prepared_files.kept_measured
-            },
+            available_paths={item.rel for item in prepared_files.kept_measured},
         )
     except ValueError as e:
         parser.error(f"pack: {e}")
@@ -607,47 +672,250 @@ def _apply_focus_selection(
     filtered = [
         item
         for item in prepared_files.kept_measured
-        if item.path.relative_to(root).as_posix() in focus_selection.selected_paths
+        if item.rel in focus_selection.selected_paths
     ]
     if not filtered:
         parser.error("pack: focus options produced an empty file set")
     return filtered, focus_selection
 
 
+def _root_entry_signatures(root: Path) -> Iterator[str]:
+    # Rendering reads root-level setup files (pyproject.toml, package.json, ...)
+    # that may not be part of the packed file set.
+    try:
+        entries = sorted(os.scandir(root), key=lambda entry: entry.name)
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if not entry.is_file():
+                continue
+            stat = entry.stat()
+        except OSError:
+            continue
+        yield f"{entry.name}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+_RACY_MTIME_NS = 2_000_000_000
+
+
+def _pack_run_stat_key(
+    *,
+    root: Path,
+    label: str,
+    slug: str,
+    options: PackOptions,
+    default_output: Path,
+    files: list[Path],
+) -> str | None:
+    """Key a run by discovered paths and their stat metadata.
+
+    Checked before any file is read, so an unchanged tree is served from the
+    cache without measuring, sniffing or tokenizing. Returns ``None`` if a
+    discovered file can no longer be stat-ed or was modified so recently that
+    a same-size rewrite could still share its timestamp (coarse filesystem
+    clocks); the content key then decides.
+    """
+    racy_after = time.time_ns() - _RACY_MTIME_NS
+    signatures: list[str] = []
+    for path in files:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        if st.st_mtime_ns > racy_after:
+            return None
+        signatures.append(f"{_rel_posix(path, root)}:{st.st_mtime_ns}:{st.st_size}")
+
+    def parts() -> Iterator[str]:
+        yield _codecrate_version()
+        yield root.as_posix()
+        yield label
+        yield slug
+        yield default_output.as_posix()
+        yield repr(options)
+        yield TokenCounter(options.token_count_encoding).backend
+        yield from _root_entry_signatures(root)
+        yield from signatures
+
+    return pack_cache_key(parts())
+
+
+def _emit_pack_run_warnings(run: PackRun) -> None:
+    # Replays the warnings measuring printed (or, in a worker, recorded) for
+    # this run: used for cache hits and for repos packed in worker processes.
+    _emit_measure_warnings(
+        label=run.label,
+        root=run.root,
+        token_counter_error=run.token_counter_error,
+        binary_rels=[
+            _rel_posix(f.path, run.root)
+            for f in run.safety_findings
+            if f.reason == "binary" and f.action == "skipped"
+        ],
+        safety_findings=run.safety_findings,
+        skipped_for_budget=run.skipped_for_budget,
+    )
+
+
+def _pack_run_cache_key(
+    *,
+    root: Path,
+    label: str,
+    slug: str,
+    options: PackOptions,
+    default_output: Path,
+    prepared_files: _PreparedPackFiles,
+) -> str:
+    def parts() -> Iterator[str]:
+        yield _codecrate_version()
+        yield root.as_posix()
+        yield label
+        yield slug
+        yield default_output.as_posix()
+        yield repr(options)
+        yield prepared_files.token_backend
+        yield from _root_entry_signatures(root)
+        for finding in prepared_files.safety_findings:
+            yield f"{finding.path.as_posix()}:{finding.reason}:{finding.action}"
+        for finding in prepared_files.skipped:
+            yield f"{finding.path.as_posix()}:{finding.reason}:{finding.action}"
+        for measured in prepared_files.kept_measured:
+            yield measured.rel
+            yield measured.text
+
+    return pack_cache_key(parts())
+
+
+def _pack_run_labels(roots: list[Path]) -> list[tuple[str, str]]:
+    # ``roots`` come from _resolve_pack_roots_and_stdin and are already resolved.
+    cwd = Path.cwd().resolve()
+    used_labels: dict[str, int] = {}
+    used_slugs: dict[str, int] = {}
+    labels: list[tuple[str, str]] = []
+    for root in roots:
+        label = _unique_label(root, used_labels, cwd=cwd)
+        labels.append((label, _unique_slug(label, used_slugs)))
+    return labels
+
+
+def _pack_process_count(args: Namespace, roots: Sequence[Path]) -> int:
+    if len(roots) <= 1:
+        return 1
+    # Debug listings are printed while packing; keep them in input order.
+    if args.print_rules or args.print_files or args.print_skipped:
+        return 1
+    limit = _available_cpu_count()
+    # --max-workers, or max_workers from a repo's config, also caps how many
+    # repos are packed at once.
+    caps = [resolve_max_workers(load_config(root), args) for root in roots]
+    positive_caps = [cap for cap in caps if cap > 0]
+    if positive_caps:
+        limit = min(limit, *positive_caps)
+    return max(1, min(len(roots), limit))
+
+
+def _pack_thread_budget(process_count: int) -> int:
+    """Thread cap for each of ``process_count`` concurrent pack processes.
+
+    Splits the usable cores between the processes so their read and
+    tokenizer pools together stay near one thread per core instead of each
+    sizing itself from every core. Used only when max_workers is unset.
+    """
+    if process_count <= 1:
+        return 0
+    return max(1, _available_cpu_count() // process_count)
+
+
+def _build_pack_run_in_process(
+    args: Namespace, root: Path, label: str, slug: str, thread_budget: int
+) -> PackRun:
+    # ArgumentParser instances are not picklable; rebuild the pack parser here
+    # so parser.error() in the worker reports through the same prog/usage.
+    # Warnings are recorded on the run and printed by the parent in input
+    # order instead of interleaving on the shared stderr.
+    return _build_single_pack_run(
+        build_parser(["pack"]),
+        args,
+        root=root,
+        stdin_files=None,
+        label=label,
+        slug=slug,
+        emit_warnings=False,
+        thread_budget=thread_budget,
+    )
+
+
 def _build_single_pack_run(
     parser: ArgumentParser,
     args: Namespace,
     *,
     root: Path,
     stdin_files: list[Path] | None,
-    used_labels: set[str],
-    used_slugs: set[str],
+    label: str,
+    slug: str,
+    emit_warnings: bool = True,
+    thread_budget: int = 0,
 ) -> PackRun:
     cfg = load_config(root)
     try:
         options = resolve_pack_options(cfg, args)
     except ValueError as e:
         parser.error(f"pack: {e}")
-    label = _unique_label(root, used_labels)
-    slug = _unique_slug(label, used_slugs)
+    default_output = _resolve_output_path(cfg, args, root)
 
     if args.print_rules:
         _print_effective_rules(label=label, root=root, options=options)
 
-    discovery_state = _discover_and_filter_files(
-        parser,
-        label=label,
-        root=root,
-        options=options,
-        stdin_files=stdin_files,
-    )
+    disc = _discover_pack_files(root=root, options=options, stdin_files=stdin_files)
+
+    cache_dir: Path | None = None
+    stat_key: str | None = None
+    if args.cache and not (args.print_files or args.print_skipped):
+        cache_dir = args.cache_dir or default_pack_cache_dir()
+        stat_key = _pack_run_stat_key(
+            root=root,
+            label=label,
+            slug=slug,
+            options=options,
+            default_output=default_output,
+            files=disc.files,
+        )
+        aliased = load_cache_alias(cache_dir, stat_key) if stat_key else None
+        cached = load_cached_pack_run(cache_dir, aliased) if aliased else None
+        if cached is not None:
+            if emit_warnings:
+                _emit_pack_run_warnings(cached)
+            return cached
+
+    discovery_state = _filter_discovered_files(parser, disc=disc, options=options)
     prepared_files = _measure_and_apply_budgets(
         parser,
         label=label,
         options=options,
         discovery_state=discovery_state,
+        max_workers=options.max_workers if options.max_workers > 0 else thread_budget,
+        emit_warnings=emit_warnings,
     )
 
+    cache_key = ""
+    if cache_dir is not None:
+        # Touched but unchanged files miss the stat key; the content key
+        # still finds the run and re-points the stat key at it.
+        cache_key = _pack_run_cache_key(
+            root=root,
+            label=label,
+            slug=slug,
+            options=options,
+            default_output=default_output,
+            prepared_files=prepared_files,
+        )
+        cached = load_cached_pack_run(cache_dir, cache_key)
+        if cached is not None:
+            if stat_key:
+                store_cache_alias(cache_dir, stat_key, cache_key)
+            return cached
+
     selected_measured, focus_selection = _apply_focus_selection(
         parser,
         root=discovery_state.discovery.root,
@@ -682,7 +950,7 @@ def _build_single_pack_run(
         dedupe=options.dedupe,
         symbol_backend=options.symbol_backend,
         file_texts=prepared_files.file_texts,
-        max_workers=options.max_workers,
+        max_workers=prepared_files.max_workers,
         encoding_errors=options.encoding_errors,
     )
     use_stubs = options.layout == "stubs" or (
@@ -700,29 +968,23 @@ def _build_single_pack_run(
     redacted_count = sum(
         1 for f in prepared_files.safety_findings if f.action == "redacted"
     )
-    safety_entries = [
-        {
-            "path": f.path.relative_to(discovery_state.discovery.root).as_posix(),
-            "reason": f.reason,
-            "action": f.action,
-        }
-        for f in sorted(
-            prepared_files.safety_findings,
-            key=lambda item: (
-                item.path.relative_to(discovery_state.discovery.root).as_posix(),
-                item.action,
-                item.reason,
-            ),
-        )
-    ]
+    safety_entries = sorted(
+        (
+            {
+                "path": f.path.relative_to(discovery_state.discovery.root).as_posix(),
+                "reason": f.reason,
+                "action": f.action,
+            }
+            for f in prepared_files.safety_findings
+        ),
+        key=lambda entry: (entry["path"], entry["action"], entry["reason"]),
+    )
     effective_nav_mode = _resolve_effective_nav_mode(
         options.nav_mode,
         options.split_max_chars,
     )
     usage_context = _build_usage_context(
-        cfg=cfg,
-        args=args,
-        root=root,
+        output_path=default_output,
         options=options,
     )
     rendered = render_markdown_result(
@@ -754,29 +1016,35 @@ def _build_single_pack_run(
     total_file_tokens = 0
     if options.token_report:
         output_tokens = prepared_files.count_tokens(md)
-        diag_files = [
-            _MeasuredFile(
-                path=fp.path,
-                rel=fp.path.relative_to(pack.root).as_posix(),
-                text=(
-                    fp.original_text if effective_layout == "full" else fp.stubbed_text
-                ),
-                size_bytes=prepared_files.file_bytes.get(
-                    fp.path.relative_to(pack.root).as_posix(),
-                    len(fp.original_text.encode("utf-8")),
-                ),
+        diag_files: list[_MeasuredFile] = []
+        for fp in pack.files:
+            rel = fp.path.relative_to(pack.root).as_posix()
+            text = fp.original_text if effective_layout == "full" else fp.stubbed_text
+            # Budget checks already counted the measured text; reuse those
+            # counts whenever the reported variant is that same text.
+            known = prepared_files.raw_token_counts.get(rel)
+            if known is not None and text == prepared_files.file_texts.get(fp.path):
+                file_tokens[rel] = known
+                continue
+            # Sizes were recorded while measuring; only re-encode files that
+            # bypassed measurement instead of encoding every file as a default.
+            size_bytes = prepared_files.file_bytes.get(rel)
+            if size_bytes is None:
+                size_bytes = _utf8_size(fp.original_text)
+            file_tokens[rel] = 0
+            diag_files.append(
+                _MeasuredFile(path=fp.path, rel=rel, text=text, size_bytes=size_bytes)
+            )
+        file_tokens.update(
+            _count_tokens_parallel(
+                files=diag_files,
+                count_fn=prepared_files.count_tokens,
+                max_workers=prepared_files.max_workers,
             )
-            for fp in pack.files
-        ]
-        file_tokens = _count_tokens_parallel(
-            files=diag_files,
-            count_fn=prepared_files.count_tokens,
-            max_workers=options.max_workers,
         )
         total_file_tokens = sum(file_tokens.values())
 
-    default_output = _resolve_output_path(cfg, args, root)
-    return PackRun(
+    pack_run = PackRun(
         root=root,
         label=label,
         slug=slug,
@@ -800,4 +1068,12 @@ def _build_single_pack_run(
         manifest=manifest_obj,
         manifest_sha256=manifest_checksum,
         focus_selection=focus_selection,
+        skipped_for_budget=prepared_files.skipped_for_budget,
+        token_counter_error=prepared_files.token_counter_error,
     )
+    if cache_dir is not None:
+        store_cached_pack_run(cache_dir, cache_key, pack_run)
+        if stat_key:
+            store_cache_alias(cache_dir, stat_key, cache_key)
+        prune_pack_cache(cache_dir)
+    return pack_run
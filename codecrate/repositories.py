@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
 
 from .fences import is_fence_close, parse_fence_open
 
+_SLUG_UNSAFE_RE = re.compile(r"[^\w-]+")
+_SLUG_DASH_RUN_RE = re.compile(r"-{2,}")
+
 
 @dataclass(frozen=True)
 class RepositorySection:
@@ -13,27 +17,33 @@ class RepositorySection:
 
 
 def slugify_repo_label(label: str) -> str:
-    safe: list[str] = []
-    for ch in label:
-        if ch.isalnum() or ch in {"-", "_"}:
-            safe.append(ch)
-        else:
-            safe.append("-")
-    slug = "".join(safe).strip("-")
-    while "--" in slug:
-        slug = slug.replace("--", "-")
+    # \w matches str.isalnum() characters plus "_", so non-ASCII labels keep
+    # their letters exactly as the previous per-character loop did.
+    slug = _SLUG_DASH_RUN_RE.sub("-", _SLUG_UNSAFE_RE.sub("-", label)).strip("-")
     return slug or "repo"
 
 
-def _unique_slug(base_label: str, used: set[str]) -> str:
-    base = slugify_repo_label(base_label)
-    slug = base
-    idx = 2
-    while slug in used:
-        slug = f"{base}-{idx}"
+def _claim_unique_name(base: str, used: dict[str, int]) -> str:
+    """Return ``base`` or the first free ``base-N`` and mark it as used.
+
+    ``used`` maps every claimed name to the next suffix worth trying for it, so
+    repeated collisions on one base resume where the previous one stopped.
+    """
+    idx = used.get(base)
+    if idx is None:
+        used[base] = 2
+        return base
+    name = f"{base}-{idx}"
+    while name in used:
         idx += 1
-    used.add(slug)
-    return slug
+        name = f"{base}-{idx}"
+    used[base] = idx + 1
+    used[name] = 2
+    return name
+
+
+def _unique_slug(base_label: str, used: dict[str, int]) -> str:
+    return _claim_unique_name(slugify_repo_label(base_label), used)
 
 
 def split_repository_sections(markdown_text: str) -> list[RepositorySection]:
@@ -63,7 +73,7 @@ def split_repository_sections(markdown_text: str) -> list[RepositorySection]:
     if not headers:
         return []
 
-    used_slugs: set[str] = set()
+    used_slugs: dict[str, int] = {}
     sections: list[RepositorySection] = []
     for pos, (start_idx, label) in enumerate(headers):
         body_start = start_idx + 1
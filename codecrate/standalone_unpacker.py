@@ -36,6 +36,8 @@ _FENCE_OPEN_RE = re.compile(
     r"^(?P<fence>`{3,})[ \t]*(?P<info>[A-Za-z0-9_-]+)(?:[ \t]+.*)?$"
 )
 _MARK_RE = re.compile(r"FUNC:(?:v\d+:)?(?P<id>[0-9A-Fa-f]{8})")
+_SLUG_UNSAFE_RE = re.compile(r"[^\w-]+")
+_SLUG_DASH_RUN_RE = re.compile(r"-{2,}")
 
 __SHARED_RUNTIME__
 
@@ -336,6 +338,7 @@ def _shared_runtime_source() -> str:
         _render_source(fences.is_fence_close),
         _render_source(repositories.RepositorySection),
         _render_source(repositories.slugify_repo_label),
+        _render_source(repositories._claim_unique_name),
         _render_source(repositories._unique_slug),
         _render_source(repositories.split_repository_sections),
         _render_source(mdparse.PackedMarkdown),
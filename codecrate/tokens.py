@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import hashlib
+import heapq
 import importlib
 import threading
 from dataclasses import dataclass
+from operator import itemgetter
 from typing import Any, cast
 
 try:  # Optional dependency
@@ -66,7 +68,9 @@ class TokenCounter:
         if enc is None:
             result = _approx_tokens(text)
         else:
-            result = len(enc.encode(text))
+            # Packed sources are plain text: encode_ordinary skips the
+            # special-token scan and never rejects text like "<|endoftext|>".
+            result = len(enc.encode_ordinary(text))
 
         with _TOKEN_COUNT_CACHE_LOCK:
             _TOKEN_COUNT_CACHE[key] = result
@@ -133,7 +137,8 @@ def format_token_count_tree(file_tokens: dict[str, int], threshold: int = 0) ->
 def format_top_files(file_tokens: dict[str, int], top_n: int) -> str:
     if top_n <= 0:
         return ""
-    items = sorted(file_tokens.items(), key=lambda kv: kv[1], reverse=True)[:top_n]
+    # nlargest keeps sorted()'s tie order and avoids sorting every file.
+    items = heapq.nlargest(top_n, file_tokens.items(), key=itemgetter(1))
     lines = ["Top files by tokens:"]
     for i, (path, n) in enumerate(items, 1):
         lines.append(f"{i:>2}. {path} ({n} tokens)")
@@ -143,7 +148,7 @@ def format_top_files(file_tokens: dict[str, int], top_n: int) -> str:
 def format_top_files_by_size(file_sizes: dict[str, int], top_n: int) -> str:
     if top_n <= 0:
         return ""
-    items = sorted(file_sizes.items(), key=lambda kv: kv[1], reverse=True)[:top_n]
+    items = heapq.nlargest(top_n, file_sizes.items(), key=itemgetter(1))
     lines = ["Top files by size (heuristic tokens):"]
     for i, (path, n_bytes) in enumerate(items, 1):
         approx = approx_tokens_from_bytes(n_bytes)
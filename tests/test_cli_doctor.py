@@ -5,6 +5,7 @@ from pathlib import Path
 
 import pytest
 
+from codecrate import config_loader
 from codecrate.cli import main
 
 
@@ -122,3 +123,26 @@ def test_doctor_rejects_non_directory_root(tmp_path: Path) -> None:
         main(["doctor", str(not_dir)])
 
     assert excinfo.value.code == 2
+
+
+def test_doctor_parses_selected_config_once(
+    tmp_path: Path, capsys, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / ".codecrate.toml").write_text(
+        "[codecrate]\noutput = 'dot.md'\n",
+        encoding="utf-8",
+    )
+    parsed: list[str] = []
+    real_loads = config_loader.tomllib.loads
+
+    def counting_loads(text: str) -> object:
+        parsed.append(text)
+        return real_loads(text)
+
+    monkeypatch.setattr(config_loader.tomllib, "loads", counting_loads)
+    config_loader._parse_toml_file.cache_clear()
+
+    main(["doctor", str(tmp_path)])
+
+    assert "- .codecrate.toml: present (section found)" in capsys.readouterr().out
+    assert parsed == ["[codecrate]\noutput = 'dot.md'\n"]
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from pathlib import Path
+
 import pytest
 
 from codecrate.cli import main
+from codecrate.cli_parser import build_parser
 
 
 def test_main_without_command_prints_friendly_help(capsys) -> None:
@@ -75,3 +78,24 @@ def test_pack_help_clarifies_explicit_file_behavior(capsys) -> None:
     assert "--locator-space" in captured.out
     assert "reconstructed when --emit-standalone-unpacker" in captured.out
     assert "enabled, otherwise markdown" in captured.out
+
+
+def test_build_parser_only_registers_selected_command_args() -> None:
+    parser = build_parser(["unpack", "context.md", "-o", "out"])
+
+    args = parser.parse_args(["unpack", "context.md", "-o", "out"])
+    assert args.cmd == "unpack"
+    assert args.out_dir == Path("out")
+    with pytest.raises(SystemExit):
+        parser.parse_args(["pack", ".", "--profile", "agent"])
+
+
+def test_top_level_help_lists_stubbed_commands(capsys) -> None:
+    with pytest.raises(SystemExit) as exc:
+        main(["--help"])
+    assert exc.value.code == 0
+
+    captured = capsys.readouterr()
+    for name in ("pack", "unpack", "patch", "apply", "doctor", "config"):
+        assert name in captured.out
+    assert "Reconstruct files from a packed context Markdown." in captured.out
@@ -14,3 +14,47 @@ def test_python_m_codecrate_version_works() -> None:
 
     assert result.returncode == 0
     assert result.stdout.startswith("codecrate ")
+
+
+def test_top_level_help_does_not_import_subsystems() -> None:
+    code = (
+        "import sys\n"
+        "from codecrate.cli import main\n"
+        "try:\n"
+        "    main(['-h'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "loaded = [m for m in ('codecrate.unpacker', 'codecrate.packer',"
+        " 'codecrate.cli_parser_pack') if m in sys.modules]\n"
+        "print('LOADED=' + ','.join(loaded))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert result.returncode == 0
+    assert "LOADED=\n" in result.stdout
+
+
+def test_help_does_not_import_package_metadata() -> None:
+    code = (
+        "import sys\n"
+        "from codecrate.cli import main\n"
+        "try:\n"
+        "    main(['unpack', '-h'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print('METADATA=' + str('importlib.metadata' in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert result.returncode == 0
+    assert "METADATA=False\n" in result.stdout
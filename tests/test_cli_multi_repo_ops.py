@@ -5,6 +5,7 @@ from pathlib import Path
 
 import pytest
 
+from codecrate import cli_pack
 from codecrate.cli import main
 from codecrate.repositories import split_repository_sections
 
@@ -414,3 +415,64 @@ def test_pack_multi_repo_split_preserves_repo_boundaries_and_fences(
 
     for part in repo1_parts + repo2_parts:
         assert _count_fence_lines(part.read_text(encoding="utf-8")) % 2 == 0
+
+
+def test_pack_multi_repo_skips_splitting_when_any_repo_has_no_limit(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo1 = tmp_path / "repo1"
+    repo2 = tmp_path / "repo2"
+    _write_repo(repo1, "a.py", "def alpha():\n    return 1\n" + "# c\n" * 40)
+    (repo1 / ".codecrate.toml").write_text(
+        "[codecrate]\nsplit_max_chars = 500\n", encoding="utf-8"
+    )
+    _write_repo(repo2, "b.py", "def beta():\n    return 2\n")
+
+    def fail_split(*args: object, **kwargs: object) -> object:
+        raise AssertionError("split_by_max_chars should not run")
+
+    monkeypatch.setattr(cli_pack, "split_by_max_chars", fail_split)
+    packed = tmp_path / "combined.md"
+    main(["pack", "--repo", str(repo1), "--repo", str(repo2), "-o", str(packed)])
+
+    assert packed.exists()
+    assert not list(tmp_path.glob("combined.repo1.part*.md"))
+
+
+def test_pack_multi_repo_split_parts_match_with_and_without_index_json(
+    tmp_path: Path,
+) -> None:
+    repo1 = tmp_path / "repo1"
+    repo2 = tmp_path / "repo2"
+    _write_repo(repo1, "a.py", "def alpha():\n    return 1\n\n" + "# c\n" * 40)
+    _write_repo(repo2, "b.py", "def beta():\n    return 2\n\n" + "# n\n" * 40)
+
+    def _pack(out_dir: Path, *extra: str) -> dict[str, str]:
+        out_dir.mkdir()
+        main(
+            [
+                "pack",
+                "--repo",
+                str(repo1),
+                "--repo",
+                str(repo2),
+                "--split-max-chars",
+                "700",
+                "-o",
+                str(out_dir / "combined.md"),
+                *extra,
+            ]
+        )
+        return {
+            p.name: p.read_text(encoding="utf-8")
+            for p in out_dir.glob("combined.repo*.md")
+        }
+
+    plain = _pack(tmp_path / "plain")
+    indexed = _pack(tmp_path / "indexed", "--index-json")
+
+    assert plain
+    assert plain == indexed
+    for name, text in plain.items():
+        label = "repo1" if ".repo1." in name else "repo2"
+        assert text.startswith(f"# Repository: {label}\n\n")
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from codecrate import cli_pack_helpers
+from codecrate.cli_pack_helpers import (
+    _combine_pack_markdown,
+    _is_likely_binary,
+    _measure_and_count_files,
+    _measure_files,
+    _pack_has_effective_dedupe,
+    _print_pack_summary,
+    _read_fd_bytes,
+    _rel_posix,
+    _utf8_size,
+    _write_split_parts,
+)
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_write_split_parts_writes_every_part(tmp_path: Path, max_workers: int) -> None:
+    parts = [
+        (tmp_path / f"part{idx}.md", ("# Repository: r\n\n", f"body {idx}\n"))
+        for idx in range(6)
+    ]
+    _write_split_parts(parts, max_workers=max_workers)
+
+    for path, texts in parts:
+        assert path.read_text(encoding="utf-8") == "".join(texts)
+
+
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [
+        (b"", False),
+        (b"print('hi')\n", False),
+        ("naïve café\n".encode(), False),
+        (b"text\x00more", True),
+        (b"\x01\x02\x03ab", True),
+        (b"\x01\x02\x03" + b"a" * 7, False),
+        (b"a" * 5000 + b"\x01" * 5000, False),
+        (b"%PDF-1.7\n%comment\n1 0 obj\n", True),
+        (b"GIF89a" + b"a" * 100, True),
+        ("\ufeffx = 1\n".encode(), False),
+        (b"%PDF is not a header\n", False),
+    ],
+)
+def test_is_likely_binary(data: bytes, expected: bool) -> None:
+    assert _is_likely_binary(data) is expected
+
+
+def test_read_measured_file_mmap_path_matches_read_path(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "text.py").write_bytes("x = 'ü'\r\ny = 2\r\n".encode())
+    (tmp_path / "blob.bin").write_bytes(b"\x00\x01\x02" * 100)
+    (tmp_path / "empty.txt").write_bytes(b"")
+    paths = sorted(tmp_path.iterdir())
+
+    def measure() -> list[object]:
+        return [
+            cli_pack_helpers._read_measured_file(
+                p, tmp_path, None, encoding_errors="replace"
+            )
+            for p in paths
+        ]
+
+    small = measure()
+    monkeypatch.setattr(cli_pack_helpers, "_MMAP_MIN_BYTES", 1)
+    assert measure() == small
+    assert [m.is_binary for m in small] == [True, False, False]
+    assert small[2].text == "x = 'ü'\ny = 2\n"
+
+
+def test_print_pack_summary_uses_known_token_count(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    _print_pack_summary(
+        out_path=Path("context.md"),
+        markdown="x" * 40,
+        total_files=1,
+        encoding="o200k_base",
+        known_tokens=12345,
+    )
+
+    assert "12,345 tokens" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("size_hint", [0, 3, 10, 100])
+def test_read_fd_bytes_reads_past_stale_size_hint(
+    tmp_path: Path, size_hint: int
+) -> None:
+    path = tmp_path / "data.txt"
+    path.write_bytes(b"0123456789")
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        assert _read_fd_bytes(fd, size_hint) == b"0123456789"
+    finally:
+        os.close(fd)
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_measure_files_batches_preserve_input_order(
+    tmp_path: Path, max_workers: int
+) -> None:
+    paths = []
+    for i in range(150):
+        path = tmp_path / f"m{i:03d}.py"
+        path.write_text(f"value = {i}\n", encoding="utf-8")
+        paths.append(path)
+    paths.reverse()
+
+    measured = _measure_files(files=paths, root=tmp_path, max_workers=max_workers)
+
+    assert [m.path for m in measured] == paths
+    assert measured[0].text == "value = 149\n"
+
+
+@pytest.mark.parametrize("text", ["", "plain ascii\n", "café → \U0001f600\n"])
+def test_utf8_size_matches_encoded_length(text: str) -> None:
+    assert _utf8_size(text) == len(text.encode("utf-8"))
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_measure_and_count_files_skips_binary_counts(
+    tmp_path: Path, max_workers: int
+) -> None:
+    (tmp_path / "a.py").write_text("one two three\n", encoding="utf-8")
+    (tmp_path / "b.bin").write_bytes(b"\x00\x01" * 10)
+    (tmp_path / "c.py").write_text("four\n", encoding="utf-8")
+    files = sorted(tmp_path.iterdir())
+    counted: list[str] = []
+
+    def count(text: str) -> int:
+        counted.append(text)
+        return len(text.split())
+
+    measured, counts = _measure_and_count_files(
+        files=files, root=tmp_path, max_workers=max_workers, count_fn=count
+    )
+
+    assert [m.rel for m in measured] == ["a.py", "b.bin", "c.py"]
+    assert counts == {"a.py": 3, "c.py": 1}
+    assert sorted(counted) == ["four\n", "one two three\n"]
+
+
+def test_pack_has_effective_dedupe() -> None:
+    def pack(*ids: tuple[str, str]) -> object:
+        defs = [SimpleNamespace(id=i, local_id=local) for i, local in ids]
+        return SimpleNamespace(
+            files=[SimpleNamespace(defs=[]), SimpleNamespace(defs=defs)]
+        )
+
+    assert _pack_has_effective_dedupe(object()) is False
+    assert _pack_has_effective_dedupe(pack(("a", "a"), ("b", "b"))) is False
+    assert _pack_has_effective_dedupe(pack(("a", "a"), ("c", "b"))) is True
+
+
+@pytest.mark.parametrize(
+    ("path", "root", "expected"),
+    [
+        ("/repo/a/b.py", "/repo", "a/b.py"),
+        ("/repo/x.py", "/repo", "x.py"),
+        ("/x.py", "/", "x.py"),
+        ("rel/pkg/m.py", "rel", "pkg/m.py"),
+    ],
+)
+def test_rel_posix_matches_relative_to(path: str, root: str, expected: str) -> None:
+    assert _rel_posix(Path(path), Path(root)) == expected
+    assert Path(path).relative_to(Path(root)).as_posix() == expected
+
+
+def test_rel_posix_rejects_sibling_with_shared_prefix() -> None:
+    with pytest.raises(ValueError):
+        _rel_posix(Path("/repo2/a.py"), Path("/repo"))
+
+
+def test_resolve_worker_count_sizes_cpu_pools_by_usable_cores(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(cli_pack_helpers, "_available_cpu_count", lambda: 4)
+
+    assert cli_pack_helpers._resolve_worker_count(0, 100) == 16
+    assert cli_pack_helpers._resolve_worker_count(0, 100, kind="cpu") == 4
+    assert cli_pack_helpers._resolve_worker_count(0, 3, kind="cpu") == 3
+    assert cli_pack_helpers._resolve_worker_count(0, 1, kind="cpu") == 1
+    assert cli_pack_helpers._resolve_worker_count(6, 100, kind="cpu") == 6
+
+
+def test_combine_pack_markdown_keeps_existing_headers() -> None:
+    packs = [
+        SimpleNamespace(label="repo1", markdown="# Repository: repo1\n\nbody one\n\n"),
+        SimpleNamespace(label="repo2", markdown="body two  \n"),
+    ]
+
+    assert _combine_pack_markdown(packs) == (  # type: ignore[arg-type]
+        "# Repository: repo1\n\nbody one\n\n\n# Repository: repo2\n\nbody two\n"
+    )
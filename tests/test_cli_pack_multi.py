@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import argparse
+import time
 from pathlib import Path
+from typing import Any
 
 import pytest
 
+from codecrate import pack_pipeline
 from codecrate.cli import main
 
 
@@ -66,3 +70,116 @@ def test_pack_root_and_repo_error_suggests_one_style(
 
     captured = capsys.readouterr()
     assert "specify either positional ROOTs or --repo" in captured.err
+
+
+def test_pack_multi_repos_parallel_matches_sequential(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    repo1 = tmp_path / "repo1"
+    repo2 = tmp_path / "repo2"
+    repo3 = tmp_path / "repo3"
+    _write_repo(repo1, "a.py", "def alpha():\n    return 1\n")
+    _write_repo(repo2, "b.py", "def beta():\n    return 2\n")
+    _write_repo(repo3, "c.py", "def gamma():\n    return 3\n")
+    for repo in (repo1, repo2, repo3):
+        (repo / "blob.py").write_bytes(b"\x00\x01\x02")
+    repo_args = ["--repo", str(repo1), "--repo", str(repo2), "--repo", str(repo3)]
+
+    # Make the first repo the slowest to measure; forked workers inherit this.
+    real_filter = pack_pipeline._filter_discovered_files
+
+    def slow_filter(*args: Any, **kwargs: Any) -> Any:
+        if kwargs["disc"].root.name == "repo1":
+            time.sleep(0.3)
+        return real_filter(*args, **kwargs)
+
+    monkeypatch.setattr(pack_pipeline, "_filter_discovered_files", slow_filter)
+
+    monkeypatch.setattr(pack_pipeline, "_available_cpu_count", lambda: 1)
+    sequential = tmp_path / "sequential.md"
+    main(["pack", *repo_args, "-o", str(sequential)])
+    seq_err = capsys.readouterr().err
+
+    monkeypatch.setattr(pack_pipeline, "_available_cpu_count", lambda: 3)
+    parallel = tmp_path / "parallel.md"
+    main(["pack", *repo_args, "-o", str(parallel)])
+    par_err = capsys.readouterr().err
+
+    seq_text = sequential.read_text(encoding="utf-8")
+    par_text = parallel.read_text(encoding="utf-8")
+    assert par_text.replace("parallel.md", "sequential.md") == seq_text
+    assert par_text.index("# Repository: repo1") < par_text.index("# Repository: repo3")
+    # Warnings from worker processes are printed by the parent in repo order.
+    assert par_err.replace("parallel.md", "sequential.md") == seq_err
+    assert par_err.index("in repo1:") < par_err.index("in repo2:")
+
+
+def test_pack_process_count_honours_max_workers(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(pack_pipeline, "_available_cpu_count", lambda: 8)
+    roots = [tmp_path / name for name in ("r1", "r2", "r3")]
+    for root in roots:
+        root.mkdir()
+    args = argparse.Namespace(
+        print_rules=False, print_files=False, print_skipped=False, max_workers=None
+    )
+    assert pack_pipeline._pack_process_count(args, roots) == 3
+
+    args.max_workers = 2
+    assert pack_pipeline._pack_process_count(args, roots) == 2
+
+    args.max_workers = 0
+    assert pack_pipeline._pack_process_count(args, roots) == 3
+
+
+def test_pack_process_count_honours_config_max_workers(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(pack_pipeline, "_available_cpu_count", lambda: 8)
+    roots = [tmp_path / name for name in ("r1", "r2", "r3")]
+    for root in roots:
+        root.mkdir()
+    (roots[1] / "codecrate.toml").write_text(
+        "[codecrate]\nmax_workers = 2\n", encoding="utf-8"
+    )
+    args = argparse.Namespace(
+        print_rules=False, print_files=False, print_skipped=False, max_workers=None
+    )
+    assert pack_pipeline._pack_process_count(args, roots) == 2
+
+    args.max_workers = 0
+    assert pack_pipeline._pack_process_count(args, roots) == 3
+
+
+def test_pack_thread_budget_splits_cpus_between_processes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(pack_pipeline, "_available_cpu_count", lambda: 8)
+
+    assert pack_pipeline._pack_thread_budget(1) == 0
+    assert pack_pipeline._pack_thread_budget(3) == 2
+    assert pack_pipeline._pack_thread_budget(16) == 1
+
+
+def test_parallel_pack_workers_use_thread_budget(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo = tmp_path / "repo"
+    _write_repo(repo, "a.py", "def alpha():\n    return 1\n")
+    seen: list[int] = []
+    original = pack_pipeline._measure_and_apply_budgets
+
+    def spy(*args: Any, **kwargs: Any) -> Any:
+        seen.append(kwargs["max_workers"])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(pack_pipeline, "_measure_and_apply_budgets", spy)
+    parser = pack_pipeline.build_parser(["pack"])
+    for argv in (["pack", str(repo)], ["pack", str(repo), "--max-workers", "5"]):
+        args = parser.parse_args(argv)
+        pack_pipeline._build_pack_run_in_process(args, repo, "repo", "repo", 3)
+
+    assert seen == [3, 5]
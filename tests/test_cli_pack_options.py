@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import io
 import json
+import os
 import sys
+import time
 from pathlib import Path
 
 import pytest
 
+from codecrate import pack_pipeline
 from codecrate.cli import main
 from codecrate.tokens import TokenCounter
 
@@ -1545,3 +1548,127 @@ def test_pack_manifest_json_explicit_path(tmp_path: Path) -> None:
     repos = payload.get("repositories")
     assert isinstance(repos, list)
     assert len(repos) == 1
+
+
+def test_pack_cache_reuses_run_until_files_change(tmp_path: Path, monkeypatch) -> None:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "a.py").write_text("def a():\n    return 1\n", encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+    out_path = tmp_path / "context.md"
+    argv = [
+        "pack",
+        str(repo),
+        "-o",
+        str(out_path),
+        "--cache",
+        "--cache-dir",
+        str(cache_dir),
+    ]
+
+    main(argv)
+    first = out_path.read_text(encoding="utf-8")
+    assert len(list(cache_dir.glob("*.pickle"))) == 1
+
+    real_pack_repo = pack_pipeline.pack_repo
+
+    def _fail_pack_repo(*args, **kwargs):
+        raise AssertionError("pack_repo should not run on a cache hit")
+
+    monkeypatch.setattr(pack_pipeline, "pack_repo", _fail_pack_repo)
+    out_path.unlink()
+    main(argv)
+    assert out_path.read_text(encoding="utf-8") == first
+
+    monkeypatch.setattr(pack_pipeline, "pack_repo", real_pack_repo)
+    (repo / "a.py").write_text("def a():\n    return 2\n", encoding="utf-8")
+    main(argv)
+    assert "return 2" in out_path.read_text(encoding="utf-8")
+    assert len(list(cache_dir.glob("*.pickle"))) == 2
+
+
+def _age_tree(root: Path, seconds: int = 60) -> None:
+    past = time.time() - seconds
+    for path in root.rglob("*"):
+        os.utime(path, (past, past))
+
+
+def test_pack_cache_stat_hit_skips_reading_files(
+    tmp_path: Path, monkeypatch, capsys
+) -> None:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "a.py").write_text("def a():\n    return 1\n", encoding="utf-8")
+    (repo / "blob.py").write_bytes(b"\x00\x01\x02")
+    _age_tree(repo)
+    cache_dir = tmp_path / "cache"
+    out_path = tmp_path / "context.md"
+    argv = ["pack", str(repo), "-o", str(out_path), "--cache", "--cache-dir"]
+    argv.append(str(cache_dir))
+
+    main(argv)
+    first = out_path.read_text(encoding="utf-8")
+    first_err = capsys.readouterr().err
+    assert "likely-binary" in first_err
+    assert len(list(cache_dir.glob("*.key"))) == 1
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("files should not be measured on a stat-key hit")
+
+    monkeypatch.setattr(pack_pipeline, "_measure_and_apply_budgets", _fail)
+    out_path.unlink()
+    main(argv)
+
+    assert out_path.read_text(encoding="utf-8") == first
+    # Warnings printed while measuring are replayed from the cached run.
+    assert "likely-binary" in capsys.readouterr().err
+
+
+def test_pack_cache_touched_files_fall_back_to_content_key(
+    tmp_path: Path, monkeypatch
+) -> None:
+    repo = tmp_path / "repo"
+    (repo / "src").mkdir(parents=True)
+    (repo / "src" / "a.py").write_text("def a():\n    return 1\n", encoding="utf-8")
+    _age_tree(repo, seconds=120)
+    cache_dir = tmp_path / "cache"
+    out_path = tmp_path / "context.md"
+    argv = ["pack", str(repo), "-o", str(out_path), "--cache", "--cache-dir"]
+    argv.append(str(cache_dir))
+    main(argv)
+
+    def _fail_pack_repo(*args, **kwargs):
+        raise AssertionError("pack_repo should not run on a content-key hit")
+
+    monkeypatch.setattr(pack_pipeline, "pack_repo", _fail_pack_repo)
+    past = time.time() - 60
+    os.utime(repo / "src" / "a.py", (past, past))
+    main(argv)
+
+    assert len(list(cache_dir.glob("*.pickle"))) == 1
+    assert len(list(cache_dir.glob("*.key"))) == 2
+
+
+def test_pack_cache_skips_stat_key_for_recently_modified_files(tmp_path: Path) -> None:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "a.py").write_text("x = 1\n", encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+    out_path = tmp_path / "context.md"
+
+    main(
+        [
+            "pack",
+            str(repo),
+            "-o",
+            str(out_path),
+            "--cache",
+            "--cache-dir",
+            str(cache_dir),
+        ]
+    )
+
+    # A same-size rewrite could still share a.py's timestamp, so only the
+    # content key is stored.
+    assert len(list(cache_dir.glob("*.pickle"))) == 1
+    assert list(cache_dir.glob("*.key")) == []
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from codecrate import cli_shared
+from codecrate.diffgen import generate_patch_markdown
+from codecrate.discover import discover_python_files
+from codecrate.markdown import render_markdown
+from codecrate.packer import pack_repo
+
+
+def test_write_text_chunked_matches_write_text(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(cli_shared, "_WRITE_CHUNK_CHARS", 4)
+    text = "def f():\n    return 'ünïcødé'\n" * 3
+    chunked = tmp_path / "chunked.md"
+    cli_shared._write_text_chunked(chunked, text)
+
+    assert chunked.read_bytes() == text.encode("utf-8")
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"", b"a\r\nb\rc\n", "café\n".encode(), b"ok\xff\r\nbad\n"],
+)
+def test_read_text_with_policy_mmap_path_matches_read_text(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, data: bytes
+) -> None:
+    path = tmp_path / "pack.md"
+    path.write_bytes(data)
+    expected = path.read_text(encoding="utf-8", errors="replace")
+    monkeypatch.setattr(cli_shared, "_MMAP_READ_MIN_BYTES", 1)
+
+    assert (
+        cli_shared._read_text_with_policy(path, encoding_errors="replace") == expected
+    )
+    if b"\xff" in data:
+        with pytest.raises(ValueError, match="Failed to decode UTF-8"):
+            cli_shared._read_text_with_policy(path, encoding_errors="strict")
+
+
+def test_verify_patch_baseline_reports_mismatches_in_diff_order(
+    tmp_path: Path,
+) -> None:
+    baseline: dict[str, str] = {}
+    diffs = []
+    for idx in range(8):
+        rel = f"m{idx}.py"
+        (tmp_path / rel).write_text(f"x = {idx}\n", encoding="utf-8")
+        baseline[rel] = cli_shared._sha256_text(f"x = {idx if idx % 3 else -1}\n")
+        diffs.append(SimpleNamespace(path=rel, op="modify"))
+    (tmp_path / "new.py").write_text("", encoding="utf-8")
+    diffs.append(SimpleNamespace(path="new.py", op="add"))
+
+    with pytest.raises(SystemExit) as excinfo:
+        cli_shared._verify_patch_baseline(
+            root=tmp_path,
+            diffs=diffs,
+            patch_meta={"baseline_files_sha256": baseline},
+            encoding_errors="strict",
+        )
+
+    message = str(excinfo.value)
+    assert "for 4 file(s): m0.py (baseline sha mismatch), m3.py" in message
+    assert "m6.py (baseline sha mismatch), new.py (expected absent before add)" in (
+        message
+    )
+
+
+@pytest.mark.parametrize(
+    ("md_text", "expected"),
+    [
+        ("no fences here\n", "\n"),
+        ("```diff\n-a\n+b\n```\n", "-a\n+b\n"),
+        ("```diff\r\n-a\r\n+b\r\n```\r\n", "-a\n+b\n"),
+        ("  ````  diff extra\n```\n+x\n````\n", "```\n+x\n"),
+        ("```python\nx\n```\n```diff\n\n+y\n```\ntail\n", "\n+y\n"),
+        ("```diff\n+a\n```\n\n```diff\n+b\n```\n", "+a\n+b\n"),
+        ("```diff\n+unterminated", "+unterminated\n"),
+        ("```diffstat\n+no\n```\n", "\n"),
+    ],
+)
+def test_cli_extract_diff_blocks_handles_fence_variants(
+    md_text: str, expected: str
+) -> None:
+    assert cli_shared._extract_diff_blocks(md_text) == expected
+
+
+def test_baseline_mismatch_accepts_lf_and_crlf_copies(tmp_path: Path) -> None:
+    expected = cli_shared._sha256_text("def f():\n    return 1\n")
+    lf = tmp_path / "lf.py"
+    lf.write_bytes(b"def f():\n    return 1\n")
+    crlf = tmp_path / "crlf.py"
+    crlf.write_bytes(b"def f():\r\n    return 1\r\n")
+    changed = tmp_path / "changed.py"
+    changed.write_bytes(b"def f():\r\n    return 2\r\n")
+
+    def check(path: Path) -> str | None:
+        return cli_shared._baseline_mismatch(path, expected, encoding_errors="strict")
+
+    assert check(lf) is None
+    assert check(crlf) is None
+    assert check(changed) == "baseline sha mismatch"
+    assert check(tmp_path / "missing.py") == "missing; expected baseline file"
+    assert check(lf / "nested.py") == "missing; expected baseline file"
+
+
+def test_scan_patch_fences_returns_diffs_and_metadata(tmp_path: Path) -> None:
+    base = tmp_path / "base"
+    base.mkdir()
+    (base / "a.py").write_text("def f():\n    return 1\n", encoding="utf-8")
+    disc = discover_python_files(
+        base, include=["**/*.py"], exclude=[], respect_gitignore=False
+    )
+    pack, canon = pack_repo(disc.root, disc.files, keep_docstrings=True, dedupe=False)
+    old_md = render_markdown(pack, canon)
+    (base / "a.py").write_text("def f():\n    return 2\n", encoding="utf-8")
+    patch_md = generate_patch_markdown(old_md, base)
+
+    diff_text, meta = cli_shared._scan_patch_fences(patch_md)
+
+    assert diff_text == cli_shared._extract_diff_blocks(patch_md)
+    assert meta == cli_shared._extract_patch_metadata(patch_md)
+    assert isinstance(meta, dict) and "baseline_files_sha256" in meta
+
+
+def test_verify_patch_baseline_sizes_pool_from_available_cpus(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pool_sizes: list[int] = []
+    real_pool = cli_shared.ThreadPoolExecutor
+
+    def recording_pool(max_workers: int) -> ThreadPoolExecutor:
+        pool_sizes.append(max_workers)
+        return real_pool(max_workers=max_workers)
+
+    monkeypatch.setattr(cli_shared, "ThreadPoolExecutor", recording_pool)
+    monkeypatch.setattr(cli_shared, "_available_cpu_count", lambda: 1)
+    baseline: dict[str, str] = {}
+    diffs = []
+    for idx in range(8):
+        rel = f"m{idx}.py"
+        (tmp_path / rel).write_text(f"x = {idx}\n", encoding="utf-8")
+        baseline[rel] = cli_shared._sha256_text(f"x = {idx}\n")
+        diffs.append(SimpleNamespace(path=rel, op="modify"))
+
+    cli_shared._verify_patch_baseline(
+        root=tmp_path,
+        diffs=diffs,
+        patch_meta={"baseline_files_sha256": baseline},
+        encoding_errors="strict",
+    )
+
+    assert pool_sizes == [4]
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from codecrate import config_loader
 from codecrate.config import (
     DEFAULT_INCLUDES,
     Config,
@@ -560,3 +561,28 @@ output = "dot_context.md"
 
     cfg = load_config(tmp_path)
     assert cfg.output == "dot_context.md"
+
+
+def test_load_config_reloads_after_file_change(tmp_path: Path) -> None:
+    """Test that cached config parsing picks up edits to the config file."""
+    cfg_file = tmp_path / "codecrate.toml"
+    cfg_file.write_text("[codecrate]\noutput = 'a.md'\n", encoding="utf-8")
+    assert load_config(tmp_path).output == "a.md"
+    assert load_config(tmp_path).output == "a.md"
+
+    cfg_file.write_text("[codecrate]\noutput = 'bb.md'\n", encoding="utf-8")
+    assert load_config(tmp_path).output == "bb.md"
+
+
+def test_parsed_config_section_is_not_shared_between_loads(tmp_path: Path) -> None:
+    """Mutating one parsed section must not leak into the cached parse."""
+    cfg_path = tmp_path / "codecrate.toml"
+    cfg_path.write_text('[codecrate]\ninclude = ["a.py"]\n', encoding="utf-8")
+    stat = cfg_path.stat()
+
+    first = config_loader._parse_config_file(cfg_path, stat.st_mtime_ns, stat.st_size)
+    first["include"].append("b.py")
+    second = config_loader._parse_config_file(cfg_path, stat.st_mtime_ns, stat.st_size)
+
+    assert second["include"] == ["a.py"]
+    assert load_config(tmp_path).include == ["a.py"]
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
@@ -460,3 +462,54 @@ def test_discover_python_files_excludes_symlink_outside_root(tmp_path: Path) ->
     rels = {p.relative_to(root).as_posix() for p in disc.files}
     assert "inside.py" in rels
     assert "leak.py" not in rels
+
+
+def test_discover_files_keeps_in_root_links_and_skips_linked_dirs(
+    tmp_path: Path,
+) -> None:
+    root = tmp_path / "repo"
+    (root / "pkg" / "sub").mkdir(parents=True)
+    (root / "pkg" / "sub" / "mod.py").write_text("pass\n", encoding="utf-8")
+    (root / ".hidden.py").write_text("pass\n", encoding="utf-8")
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "other.py").write_text("pass\n", encoding="utf-8")
+    _symlink_or_skip(root / "alias.py", root / "pkg" / "sub" / "mod.py")
+    _symlink_or_skip(root / "linked_dir", outside)
+    _symlink_or_skip(root / "broken.py", tmp_path / "missing.py")
+
+    disc = discover_files(
+        root=root,
+        include=["**/*.py"],
+        exclude=[],
+        respect_gitignore=False,
+    )
+
+    rels = [p.relative_to(root.resolve()).as_posix() for p in disc.files]
+    assert rels == [".hidden.py", "alias.py", "pkg/sub/mod.py"]
+
+
+def test_discover_files_prunes_ignored_directories_without_dropping_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for rel in ["node_modules/lib/x.py", "b/pkg/keep.py", "b/top.py", "src/a.py"]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x = 1\n", encoding="utf-8")
+    (tmp_path / ".gitignore").write_text("node_modules\nb/*\n", encoding="utf-8")
+
+    scanned: list[str] = []
+    real_scandir = os.scandir
+
+    def scandir(path: str) -> Iterator[os.DirEntry[str]]:
+        scanned.append(Path(path).relative_to(tmp_path).as_posix())
+        return real_scandir(path)
+
+    monkeypatch.setattr("codecrate.discover.os.scandir", scandir)
+    disc = discover_files(tmp_path, include=["**/*.py"], exclude=[])
+
+    rels = [p.relative_to(tmp_path).as_posix() for p in disc.files]
+    # ``b/*`` ignores direct children only, so nested files stay selected.
+    assert rels == ["b/pkg/keep.py", "src/a.py"]
+    assert "node_modules" not in scanned
+    assert "b/pkg" in scanned
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import pickle
 from pathlib import Path
 
 import pytest
@@ -556,3 +557,10 @@ def test_resolve_pack_options_analysis_subsection_overrides(tmp_path: Path) -> N
     assert options.index_json_include_file_imports is True
     assert options.index_json_include_guide is False
     assert options.index_json_include_test_links is False
+
+
+def test_pack_options_are_slotted_and_picklable(tmp_path: Path) -> None:
+    options = resolve_pack_options(Config(), _parse_pack_args(tmp_path))
+
+    assert not hasattr(options, "__dict__")
+    assert pickle.loads(pickle.dumps(options)) == options
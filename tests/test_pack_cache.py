@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import os
+import pickle
+import stat
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from codecrate.pack_cache import (
+    PACK_ALIAS_SUFFIX,
+    PACK_CACHE_SUFFIX,
+    load_cache_alias,
+    load_cached_pack_run,
+    prune_pack_cache,
+    store_cache_alias,
+    store_cached_pack_run,
+)
+
+posix_only = pytest.mark.skipif(
+    sys.platform == "win32", reason="POSIX ownership and permission bits"
+)
+
+
+@posix_only
+def test_store_creates_private_cache_entries(tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+
+    store_cached_pack_run(cache_dir, "k", "not a run")  # type: ignore[arg-type]
+
+    entry = cache_dir / f"k{PACK_CACHE_SUFFIX}"
+    assert stat.S_IMODE(cache_dir.stat().st_mode) == 0o700
+    assert stat.S_IMODE(entry.stat().st_mode) == 0o600
+    assert not list(cache_dir.glob("*.tmp"))
+
+
+def test_load_ignores_corrupt_and_foreign_entries(tmp_path: Path) -> None:
+    (tmp_path / f"corrupt{PACK_CACHE_SUFFIX}").write_bytes(b"\x80\x05garbage")
+    (tmp_path / f"other{PACK_CACHE_SUFFIX}").write_bytes(pickle.dumps({"a": 1}))
+
+    assert load_cached_pack_run(tmp_path, "corrupt") is None
+    assert load_cached_pack_run(tmp_path, "other") is None
+    assert load_cached_pack_run(tmp_path, "missing") is None
+
+
+@posix_only
+def test_load_refuses_entries_others_can_write(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    entry = tmp_path / f"k{PACK_CACHE_SUFFIX}"
+    entry.write_bytes(pickle.dumps("payload"))
+    entry.chmod(0o666)
+    loads_calls: list[bytes] = []
+    monkeypatch.setattr(
+        "codecrate.pack_cache.pickle.loads", lambda data: loads_calls.append(data)
+    )
+
+    assert load_cached_pack_run(tmp_path, "k") is None
+    assert loads_calls == []
+
+
+@posix_only
+def test_load_refuses_entries_owned_by_another_user(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    entry = tmp_path / f"k{PACK_CACHE_SUFFIX}"
+    entry.write_bytes(pickle.dumps("payload"))
+    entry.chmod(0o600)
+    owner = entry.stat().st_uid
+    loads_calls: list[bytes] = []
+    monkeypatch.setattr(
+        "codecrate.pack_cache.pickle.loads", lambda data: loads_calls.append(data)
+    )
+    monkeypatch.setattr(os, "getuid", lambda: owner + 1)
+
+    assert load_cached_pack_run(tmp_path, "k") is None
+    assert loads_calls == []
+
+
+def _write_entry(cache_dir: Path, key: str, size: int, age: float) -> Path:
+    path = cache_dir / f"{key}{PACK_CACHE_SUFFIX}"
+    path.write_bytes(b"x" * size)
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_prune_evicts_least_recently_used_entries(tmp_path: Path) -> None:
+    old = _write_entry(tmp_path, "a" * 40, 400, age=300)
+    mid = _write_entry(tmp_path, "b" * 40, 400, age=200)
+    new = _write_entry(tmp_path, "c" * 40, 400, age=100)
+
+    prune_pack_cache(tmp_path, max_bytes=1000)
+
+    assert not old.exists()
+    assert mid.exists()
+    assert new.exists()
+
+    prune_pack_cache(tmp_path, max_bytes=10)
+
+    assert not mid.exists()
+    assert new.exists()
+
+
+def test_prune_drops_orphaned_and_superseded_aliases(tmp_path: Path) -> None:
+    kept_key = "c" * 40
+    _write_entry(tmp_path, kept_key, 10, age=0)
+    store_cache_alias(tmp_path, "old-stat", kept_key)
+    store_cache_alias(tmp_path, "gone-stat", "d" * 40)
+    stamp = time.time() - 60
+    for alias in ("old-stat", "gone-stat"):
+        os.utime(tmp_path / f"{alias}{PACK_ALIAS_SUFFIX}", (stamp, stamp))
+    store_cache_alias(tmp_path, "new-stat", kept_key)
+
+    prune_pack_cache(tmp_path)
+
+    assert load_cache_alias(tmp_path, "new-stat") == kept_key
+    assert not (tmp_path / f"old-stat{PACK_ALIAS_SUFFIX}").exists()
+    assert not (tmp_path / f"gone-stat{PACK_ALIAS_SUFFIX}").exists()
+
+
+def test_prune_removes_only_stale_temp_files(tmp_path: Path) -> None:
+    stale = tmp_path / f"k{PACK_CACHE_SUFFIX}.123.tmp"
+    fresh = tmp_path / f"k{PACK_CACHE_SUFFIX}.456.tmp"
+    stale.write_bytes(b"partial")
+    fresh.write_bytes(b"partial")
+    stamp = time.time() - 2 * 3600
+    os.utime(stale, (stamp, stamp))
+
+    prune_pack_cache(tmp_path)
+
+    assert not stale.exists()
+    assert fresh.exists()
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import pytest
+
+from codecrate.repositories import _unique_slug, slugify_repo_label
+
+
+@pytest.mark.parametrize(
+    ("label", "expected"),
+    [
+        ("repo1", "repo1"),
+        ("../a b//c", "a-b-c"),
+        ("--x__y--", "x__y"),
+        ("Grüße/Straße", "Grüße-Straße"),
+        ("///", "repo"),
+    ],
+)
+def test_slugify_repo_label(label: str, expected: str) -> None:
+    assert slugify_repo_label(label) == expected
+
+
+def test_unique_slug_skips_names_already_claimed() -> None:
+    used: dict[str, int] = {}
+    slugs = [_unique_slug(label, used) for label in ["a", "a-2", "a", "a", "a-3"]]
+
+    assert slugs == ["a", "a-2", "a-3", "a-4", "a-3-2"]
@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+from pathlib import Path
+
+import pytest
+
+from codecrate.cli_pack_helpers import _count_tokens_parallel, _MeasuredFile
 from codecrate.tokens import (
     TokenCounter,
     format_token_count_tree,
@@ -67,7 +72,7 @@ def test_token_counter_caches_by_content_hash(monkeypatch) -> None:
     calls: dict[str, int] = {"encode": 0}
 
     class _FakeEncoder:
-        def encode(self, text: str) -> list[int]:
+        def encode_ordinary(self, text: str) -> list[int]:
             calls["encode"] += 1
             return [1] * len(text)
 
@@ -77,3 +82,36 @@ def test_token_counter_caches_by_content_hash(monkeypatch) -> None:
     assert c.count("cache me") == len("cache me")
     assert c.count("cache me") == len("cache me")
     assert calls["encode"] == 1
+
+
+def test_format_top_files_keeps_insertion_order_for_ties() -> None:
+    file_tokens = {"c.py": 5, "a.py": 7, "b.py": 5, "d.py": 5}
+
+    out = format_top_files(file_tokens, top_n=3)
+
+    assert out.splitlines()[1:] == [
+        " 1. a.py (7 tokens)",
+        " 2. c.py (5 tokens)",
+        " 3. b.py (5 tokens)",
+    ]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_count_tokens_parallel_counts_identical_texts_once(max_workers: int) -> None:
+    texts = ["", "alpha beta", "", "alpha beta", "gamma"]
+    files = [
+        _MeasuredFile(path=Path(f"f{i}.py"), rel=f"f{i}.py", text=t, size_bytes=len(t))
+        for i, t in enumerate(texts)
+    ]
+    seen: list[str] = []
+
+    def count(text: str) -> int:
+        seen.append(text)
+        return len(text.split())
+
+    counts = _count_tokens_parallel(
+        files=files, count_fn=count, max_workers=max_workers
+    )
+
+    assert counts == {"f0.py": 0, "f1.py": 2, "f2.py": 0, "f3.py": 2, "f4.py": 1}
+    assert sorted(seen) == ["", "alpha beta", "gamma"]
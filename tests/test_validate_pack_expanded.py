@@ -2,8 +2,12 @@ from __future__ import annotations
 
 import re
 from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
 
 from codecrate.cli import main
+from codecrate.cli_shared import _print_grouped_validation_report
 from codecrate.mdparse import parse_packed_markdown
 from codecrate.validate import validate_pack_markdown
 
@@ -154,3 +158,27 @@ def test_validate_checks_manifest_format_versions(tmp_path: Path) -> None:
     report = validate_pack_markdown(tampered)
     assert any("Unsupported manifest format" in e for e in report.errors)
     assert any("Unsupported id_format_version" in e for e in report.errors)
+
+
+def test_print_grouped_validation_report_groups_by_scope(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    report = SimpleNamespace(
+        warnings=["repo 'a': Duplicate file block for x.py", "plain warning"],
+        errors=["repo 'a': sha mismatch for y.py"],
+    )
+    _print_grouped_validation_report(report)
+
+    assert capsys.readouterr().out == (
+        "Warnings:\n"
+        "- [repo 'a']\n"
+        "  - Duplicate file block for x.py\n"
+        "    hint: keep only one file block per path under ## Files\n"
+        "- [global]\n"
+        "  - plain warning\n"
+        "Errors:\n"
+        "- [repo 'a']\n"
+        "  - sha mismatch for y.py\n"
+        "    hint: pack content was edited after generation; "
+        "regenerate from source files\n"
+    )